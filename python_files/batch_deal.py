@@ -0,0 +1,57 @@
+import numpy as np
+
+from python_files.batch_evaluator import rank_many
+from python_files.deck import card_code
+from python_files.rng import numpy_generator, sampled_indices
+
+# Distribuzione in blocco per simulazioni ed equity: milioni di mani casuali generate con NumPy
+# invece che un Deck alla volta. Ogni mano è una riga di interi (codifiche delle carte):
+#   [carte personali del giocatore 0 (2), del giocatore 1 (2), ..., board (5)]
+# e i risultati si valutano direttamente con batch_evaluator.rank_many.
+
+BOARD_SIZE = 5
+DEFAULT_CHUNK_SIZE = 100_000  # Mani generate per volta, per limitare la memoria delle permutazioni
+
+# Carte ancora nel mazzo (int8), escluse quelle morte
+def live_codes(dead_codes):
+    return np.setdiff1d(np.arange(52, dtype=np.int8), np.asarray(dead_codes, dtype=np.int8))
+
+# Genera n_deals distribuzioni indipendenti per num_players giocatori: array (n_deals, 2 * num_players + 5) int8.
+# board: carte del board già note (uguali in ogni riga); dead_cards: carte da escludere (es. quelle dell'eroe).
+def deal_many(n_deals, num_players, dead_cards=(), board=(), generator=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    board_codes = [card_code(card) for card in board]
+    dead_codes = [card_code(card) for card in dead_cards]
+    if len(board_codes) > BOARD_SIZE:
+        raise ValueError(f"Expected at most {BOARD_SIZE} board cards, got {len(board_codes)}")
+    if len(set(board_codes + dead_codes)) != len(board_codes) + len(dead_codes):
+        raise ValueError("Duplicate cards in board and dead cards")
+    live = live_codes(board_codes + dead_codes)
+    needed = 2 * num_players + BOARD_SIZE - len(board_codes)
+    if num_players < 1 or needed > len(live):
+        raise ValueError(f"Cannot deal {num_players} players from {len(live)} live cards")
+
+    generator = generator if generator is not None else numpy_generator()
+    deals = np.empty((n_deals, 2 * num_players + BOARD_SIZE), dtype=np.int8)
+    deals[:, 2 * num_players:2 * num_players + len(board_codes)] = board_codes
+    drawn_columns = np.r_[0:2 * num_players, 2 * num_players + len(board_codes):deals.shape[1]]
+    for start in range(0, n_deals, chunk_size):
+        count = min(chunk_size, n_deals - start)
+        order = sampled_indices(count, len(live), needed, generator)
+        deals[start:start + count, drawn_columns] = live[order]
+    return deals
+
+# Mani di sette carte di ogni giocatore: array (n_deals, num_players, 7)
+def seven_card_hands(deals, num_players):
+    holes = deals[:, :2 * num_players].reshape(len(deals), num_players, 2)
+    boards = np.broadcast_to(deals[:, None, 2 * num_players:], (len(deals), num_players, BOARD_SIZE))
+    return np.concatenate((holes, boards), axis=2)
+
+# Forza della mano di ogni giocatore in ogni distribuzione: array (n_deals, num_players)
+def rank_deals(deals, num_players):
+    return rank_many(seven_card_hands(deals, num_players).reshape(-1, 7)).reshape(len(deals), num_players)
+
+# Forza della mano data (carte personali note) su ogni board delle distribuzioni: array (n_deals,)
+def rank_hole_cards(deals, hole_cards, num_players):
+    hole_codes = np.array([card_code(card) for card in hole_cards], dtype=np.int8)
+    boards = deals[:, 2 * num_players:]
+    return rank_many(np.concatenate((np.broadcast_to(hole_codes, (len(deals), 2)), boards), axis=1))
@@ -0,0 +1,96 @@
+import numpy as np
+
+from python_files.hand_evaluator import (
+    CATEGORY_SHIFT, WHEEL, ACE,
+    HIGH_CARD, PAIR, TWO_PAIRS, THREE_OF_A_KIND, STRAIGHT, FLUSH,
+    FULL_HOUSE, FOUR_OF_A_KIND, STRAIGHT_FLUSH, ROYAL_FLUSH
+)
+
+# Valutatore vettoriale: calcola con NumPy le stesse forze di hand_evaluator.evaluate
+# per interi lotti di mani codificate, senza cicli Python sulle singole mani.
+
+RANKS = np.arange(13, dtype=np.int8)
+SUITS = np.arange(4, dtype=np.int8)
+DEFAULT_CHUNK_SIZE = 200_000
+
+# I valori presenti nella maschera (N, 13), dal più alto, fino a n colonne (-1 se mancano)
+def top_ranks(mask, n):
+    values = np.where(mask, RANKS, np.int8(-1))
+    return np.sort(values, axis=1)[:, :-n - 1:-1]
+
+# Valore più alto della scala contenuta nei bitmask (N,), -1 se non c'è scala
+def straight_top(bits):
+    top = np.where((bits & WHEEL) == WHEEL, 3, -1)
+    for high in range(4, ACE + 1):
+        mask = 0b11111 << (high - 4)
+        top = np.where((bits & mask) == mask, high, top)
+    return top
+
+# Compone le forze a partire dalla categoria e dalle colonne dei valori (stessa codifica di make_strength)
+def compose(category, *columns):
+    strength = np.asarray(category, dtype=np.int64) << CATEGORY_SHIFT
+    for position, column in enumerate(columns):
+        strength = strength | (np.maximum(column, 0).astype(np.int64) << (16 - 4 * position))
+    return strength
+
+def rank_chunk(cards):
+    ranks = (cards >> 2).astype(np.int8)
+    suits = (cards & 3).astype(np.int8)
+    rank_bits = np.left_shift(1, ranks, dtype=np.int32)
+
+    counts = (ranks[:, :, None] == RANKS).sum(axis=1)
+    present = counts > 0
+    bits = np.bitwise_or.reduce(rank_bits, axis=1)
+
+    suit_counts = (suits[:, :, None] == SUITS).sum(axis=1)
+    flush_suit = suit_counts.argmax(axis=1)
+    is_flush = suit_counts.max(axis=1) >= 5
+    flush_bits = np.bitwise_or.reduce(np.where(suits == flush_suit[:, None], rank_bits, 0), axis=1)
+    flush_ranks = top_ranks(((flush_bits[:, None] >> RANKS) & 1).astype(bool), 5)
+
+    straight_flush_top = np.where(is_flush, straight_top(flush_bits), -1)
+    straight = straight_top(bits)
+
+    quad = top_ranks(counts == 4, 1)[:, 0]
+    trips = top_ranks(counts == 3, 2)
+    pairs = top_ranks(counts == 2, 3)
+    full_house_pair = np.maximum(trips[:, 1], pairs[:, 0])
+
+    quad_kicker = top_ranks(present & (RANKS != quad[:, None]), 1)
+    trips_kickers = top_ranks(present & (RANKS != trips[:, :1]), 2)
+    two_pairs_kicker = top_ranks(present & (RANKS != pairs[:, :1]) & (RANKS != pairs[:, 1:2]), 1)
+    pair_kickers = top_ranks(present & (RANKS != pairs[:, :1]), 3)
+    high_cards = top_ranks(present, 5)
+
+    conditions = [
+        straight_flush_top >= 0,
+        quad >= 0,
+        (trips[:, 0] >= 0) & (full_house_pair >= 0),
+        is_flush,
+        straight >= 0,
+        trips[:, 0] >= 0,
+        pairs[:, 1] >= 0,
+        pairs[:, 0] >= 0,
+    ]
+    choices = [
+        compose(np.where(straight_flush_top == ACE, ROYAL_FLUSH, STRAIGHT_FLUSH), straight_flush_top),
+        compose(FOUR_OF_A_KIND, quad, quad_kicker[:, 0]),
+        compose(FULL_HOUSE, trips[:, 0], full_house_pair),
+        compose(FLUSH, *flush_ranks.T),
+        compose(STRAIGHT, straight),
+        compose(THREE_OF_A_KIND, trips[:, 0], *trips_kickers.T),
+        compose(TWO_PAIRS, pairs[:, 0], pairs[:, 1], two_pairs_kicker[:, 0]),
+        compose(PAIR, pairs[:, 0], *pair_kickers.T),
+    ]
+    return np.select(conditions, choices, default=compose(HIGH_CARD, *high_cards.T))
+
+# Valuta un array (N, 5), (N, 6) o (N, 7) di carte codificate restituendo un array (N,) di forze
+def rank_many(cards_array, chunk_size=DEFAULT_CHUNK_SIZE):
+    cards = np.asarray(cards_array)
+    if cards.ndim != 2 or not 5 <= cards.shape[1] <= 7:
+        raise ValueError(f"Expected an (N, 5) to (N, 7) array of card codes, got shape {cards.shape}")
+
+    strengths = np.empty(len(cards), dtype=np.int64)
+    for start in range(0, len(cards), chunk_size):
+        strengths[start:start + chunk_size] = rank_chunk(cards[start:start + chunk_size])
+    return strengths
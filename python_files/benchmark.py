@@ -0,0 +1,65 @@
+import argparse
+import json
+import os
+import sys
+
+import pytest
+
+# Esecuzione dei benchmark (tests/test_benchmarks.py) e confronto con una baseline salvata.
+#   python -m python_files.benchmark save                      salva la baseline
+#   python -m python_files.benchmark compare --threshold 0.15  fallisce se un benchmark è più lento del 15%
+# I risultati sono i file JSON di pytest-benchmark, leggibili da altri strumenti.
+
+ROOT = os.path.normpath(os.path.join(os.path.dirname(__file__), '..'))
+BENCHMARK_TESTS = os.path.join(ROOT, 'tests', 'test_benchmarks.py')
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmark_baseline.json')
+DEFAULT_OUTPUT = os.path.join(ROOT, 'benchmark_current.json')
+DEFAULT_THRESHOLD = 0.15
+DEFAULT_STAT = 'median'
+
+# Esegue i benchmark scrivendo i risultati in output; restituisce il codice di uscita di pytest
+def run_benchmarks(output, extra_args=()):
+    return pytest.main([BENCHMARK_TESTS, '-q', '--run-benchmarks', '--benchmark-only', f'--benchmark-json={output}',
+                        *extra_args])
+
+# Statistica scelta (in secondi) di ogni benchmark di un file JSON di pytest-benchmark
+def load_stats(path, stat=DEFAULT_STAT):
+    with open(path, 'r') as file:
+        data = json.load(file)
+    return {bench['fullname']: bench['stats'][stat] for bench in data['benchmarks']}
+
+# Confronta due esecuzioni: per ogni benchmark in comune (nome, baseline, attuale, rapporto, regressione)
+def compare_runs(baseline, current, threshold=DEFAULT_THRESHOLD):
+    rows = []
+    for name in sorted(set(baseline) & set(current)):
+        ratio = current[name] / baseline[name] if baseline[name] > 0 else float('inf')
+        rows.append((name, baseline[name], current[name], ratio, ratio > 1 + threshold))
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmark suite and compare it against a stored baseline")
+    parser.add_argument('mode', choices=('save', 'compare'))
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="where compare writes the current run")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown as a fraction (0.15 = 15%%)")
+    parser.add_argument('--stat', default=DEFAULT_STAT, choices=('min', 'median', 'mean'))
+    args = parser.parse_args(argv)
+
+    output = args.baseline if args.mode == 'save' else args.output
+    exit_code = run_benchmarks(output)
+    if exit_code != 0:
+        return int(exit_code)
+    if args.mode == 'save':
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    rows = compare_runs(load_stats(args.baseline, args.stat), load_stats(args.output, args.stat), args.threshold)
+    regressions = [row for row in rows if row[4]]
+    for name, base, current, ratio, regressed in rows:
+        print(f"{'REGRESSION' if regressed else 'ok':10} {ratio:6.2f}x  {base * 1e6:10.1f} us -> {current * 1e6:10.1f} us  {name}")
+    print(f"{len(regressions)} of {len(rows)} benchmarks slower than {args.threshold:.0%} over the baseline ({args.stat})")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
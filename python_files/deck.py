@@ -1,12 +1,53 @@
 import json
 import os
 import random
+import logging
+from collections.abc import Sequence
+from functools import lru_cache
+from itertools import islice
+
+logger = logging.getLogger(__name__)
+
+# Semi e valori nell'ordine usato dalla codifica intera delle carte
+SEEDS = ('Hearts', 'Diamonds', 'Clubs', 'Spades')
+VALUES = ('2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A')
+
+_SEED_INDEX = {seed.lower(): index for index, seed in enumerate(SEEDS)}
+_VALUE_INDEX = {value: index for index, value in enumerate(VALUES)}
+
+# Codifica una carta in un intero 0-51: (indice del valore << 2) | indice del seme
+def encode_card(seed, value):
+    return (_VALUE_INDEX[value] << 2) | _SEED_INDEX[seed.lower()]
+
+# Indice del valore (0 = '2', 12 = 'A') di una carta codificata
+def card_rank(code):
+    return code >> 2
+
+# Indice del seme di una carta codificata
+def card_seed(code):
+    return code & 3
 
 # Classe che rappresenta una carta
 class Card:
+    __slots__ = ('code',)
+
     def __init__(self, seed: str, value: str):
-        self.suit = seed
-        self.value = value
+        self.code = encode_card(seed, value)
+
+    # Crea una carta a partire dalla sua codifica intera
+    @classmethod
+    def from_code(cls, code: int):
+        card = cls.__new__(cls)
+        card.code = code
+        return card
+
+    @property
+    def suit(self):
+        return SEEDS[self.code & 3]
+
+    @property
+    def value(self):
+        return VALUES[self.code >> 2]
 
     def __repr__(self):
         # Rappresentazione leggibile della carta
@@ -14,53 +55,147 @@ class Card:
 
     def __eq__(self, other: object) -> bool:
         # Confronto tra due carte (stesso seme e valore)
-        return isinstance(other, Card) and self.suit == other.suit and self.value == other.value
-
-# Classe che rappresenta un mazzo di carte
-class Deck:
-    def __init__(self, deck_file='deck.json'):
-        deck_path = os.path.join(os.path.dirname(__file__), '..', deck_file)
-        if not os.path.exists(deck_path):
-            print(f"File not found: {deck_path}")
-            self.deck_data = self.create_standard_deck()
-        else:
-            self.deck_data = self.load_deck(deck_path)
-        self.shuffle()  # Mescola le carte
-        self.print_deck()  # Stampa il mazzo per debug
-
-    def create_standard_deck(self):
-        seeds = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
-        values = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
-        return [Card(seed, value) for seed in seeds for value in values]
-
-    def load_deck(self, deck_file_path):
-        try:
-            with open(deck_file_path, 'r') as file:
-                deck = json.load(file)
-            deck_of_cards = self.create_cards(deck)
-            return deck_of_cards
-        except FileNotFoundError:
-            print(f"File not found: {deck_file_path}")
-        except json.JSONDecodeError:
-            print("Error decoding JSON from the file")
-        return self.create_standard_deck()
-
-    def create_cards(self, deck):
-        cards = []
-        for card in deck:
-            seed = card.get('seed')
-            value = card.get('value')
-            if seed and value:
-                cards.append(Card(seed, value))
-        return cards
+        return isinstance(other, Card) and self.code == other.code
+
+    def __hash__(self):
+        return self.code
+
+# Le 52 carte canoniche, indicizzate per codifica
+CARDS = tuple(Card.from_code(code) for code in range(52))
+
+# Converte una carta (Card, intero, dizionario o oggetto con value/suit) nella sua codifica intera
+def card_code(card):
+    if isinstance(card, Card):
+        return card.code
+    if isinstance(card, int):
+        return card
+    if isinstance(card, dict):
+        return encode_card(card.get('suit') or card.get('seed'), card['value'])
+    return encode_card(card.suit, card.value)
+
+# Converte una carta nella sua istanza canonica di Card
+def to_card(card):
+    return CARDS[card_code(card)]
+
+# Le 52 carte in ordine standard (seme per seme)
+def standard_cards():
+    return tuple(CARDS[encode_card(seed, value)] for seed in SEEDS for value in VALUES)
+
+# Legge le carte da un file JSON ([{"seed": ..., "value": ...}, ...]); se manca o è illeggibile usa il mazzo standard
+def load_cards(deck_path):
+    try:
+        with open(deck_path, 'r') as file:
+            deck = json.load(file)
+        return tuple(CARDS[encode_card(card['seed'], card['value'])] for card in deck
+                     if card.get('seed') and card.get('value'))
+    except FileNotFoundError:
+        logger.warning("File not found: %s", deck_path)
+    except json.JSONDecodeError:
+        logger.error("Error decoding JSON from the file %s", deck_path)
+    return standard_cards()
+
+# Insieme canonico e immutabile delle carte di un file di mazzo, letto una sola volta per processo
+@lru_cache(maxsize=None)
+def canonical_cards(deck_file='deck.json'):
+    return load_cards(os.path.join(os.path.dirname(__file__), '..', deck_file))
+
+# Vista in sola lettura su una porzione di una lista di carte, senza copiarla
+class CardsView(Sequence):
+    __slots__ = ('data', 'start', 'stop')
+
+    def __init__(self, data, start, stop):
+        self.data = data
+        self.start = start
+        self.stop = stop
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.data[i] for i in range(self.start, self.stop)[index]]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("card index out of range")
+        return self.data[self.start + index]
+
+    def __iter__(self):
+        return islice(self.data, self.start, self.stop)
+
+    def __repr__(self):
+        return f"CardsView({list(self)!r})"
+
+# Pila di carte (istanze di Card o codifiche intere) già mescolata, distribuita spostando un cursore:
+# dare, bruciare e guardare le carte rimaste non copia né accorcia la lista
+class CardStack:
+    def __init__(self, cards):
+        self.deck_data = list(cards)
+        self.position = 0
+
+    def __len__(self):
+        return len(self.deck_data) - self.position
+
+    # Distribuisce le prossime n carte
+    def deal(self, n=1):
+        start = self.position
+        if n > len(self.deck_data) - start:
+            raise ValueError(f"Cannot deal {n} cards, only {len(self.deck_data) - start} left")
+        self.position = start + n
+        return self.deck_data[start:self.position]
+
+    # Distribuisce una sola carta
+    def deal_card(self):
+        return self.deal(1)[0]
+
+    # Scarta le prossime n carte coperte
+    def burn(self, n=1):
+        self.deal(n)
+
+    # Carte non ancora distribuite, nell'ordine in cui usciranno
+    def remaining(self):
+        return CardsView(self.deck_data, self.position, len(self.deck_data))
+
+    # Estrae n carte a caso tra quelle rimaste senza distribuirle (Fisher-Yates parziale sulla parte rimasta):
+    # le simulazioni ripetono l'estrazione senza ricostruire il mazzo a ogni iterazione
+    def sample(self, n, rng=random):
+        data, start = self.deck_data, self.position
+        size = len(data) - start
+        if n > size:
+            raise ValueError(f"Cannot sample {n} cards, only {size} left")
+        draw = rng.random
+        for i in range(start, start + n):
+            j = i + int(draw() * size)
+            data[i], data[j] = data[j], data[i]
+            size -= 1
+        return data[start:start + n]
+
+# Classe che rappresenta un mazzo di carte: una permutazione delle carte canoniche,
+# rimescolata a ogni nuova mano senza rileggere il file né creare nuove carte.
+# rng mescola il mazzo: un random.Random (o il modulo random) oppure un numpy.random.Generator
+class Deck(CardStack):
+    def __init__(self, deck_file='deck.json', rng=random):
+        self.cards = canonical_cards(deck_file)
+        self.rng = rng
+        self.reset()
+        if logger.isEnabledFor(logging.DEBUG):
+            self.print_deck()  # Stampa il mazzo per debug
+
+    # Rimette nel mazzo tutte le carte e lo mescola per una nuova mano
+    def reset(self):
+        self.deck_data = list(self.cards)
+        self.shuffle()
 
+    # Mescola il mazzo e riporta il cursore in cima
     def shuffle(self):
-        random.shuffle(self.deck_data)
+        self.rng.shuffle(self.deck_data)
+        self.position = 0
 
+    # Estrae una carta dal fondo del mazzo, senza toccare il cursore
     def draw_card(self):
-        return self.deck_data.pop() if self.deck_data else None
+        return self.deck_data.pop() if len(self) else None
 
     def print_deck(self):
-        print(f"Deck size: {len(self.deck_data)}")
-        for card in self.deck_data:
-            print(card)
\ No newline at end of file
+        logger.debug("Deck size: %d", len(self))
+        for card in self.remaining():
+            logger.debug("%s", card)
@@ -0,0 +1,199 @@
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from math import comb, factorial
+
+from python_files.deck import card_code, CardStack
+from python_files.hand_evaluator import evaluate
+
+# Calcolo dell'equity di una mano tramite simulazioni Monte Carlo:
+# le carte mancanti del board e le carte degli avversari vengono estratte a caso
+# tra quelle ancora nel mazzo e ogni mano viene valutata con il valutatore a tabelle.
+
+DEFAULT_ITERATIONS = 10000
+MAX_OPPONENTS = 9
+COMPARISONS_PER_EVALUATION = 20  # Confronti di forze che costano quanto una valutazione
+
+# Carte ancora nel mazzo, escluse quelle note (carte personali, board e carte morte)
+def live_cards(dead_codes):
+    dead = set(dead_codes)
+    return [code for code in range(52) if code not in dead]
+
+# Controlla le carte e il numero di avversari e restituisce le codifiche intere
+def validate(hole_cards, board, num_opponents, dead_cards=()):
+    hole_codes = [card_code(card) for card in hole_cards]
+    board_codes = [card_code(card) for card in board]
+    if len(hole_codes) != 2:
+        raise ValueError(f"Expected 2 hole cards, got {len(hole_codes)}")
+    if len(board_codes) > 5:
+        raise ValueError(f"Expected at most 5 board cards, got {len(board_codes)}")
+    if not 1 <= num_opponents <= MAX_OPPONENTS:
+        raise ValueError(f"num_opponents must be between 1 and {MAX_OPPONENTS}, got {num_opponents}")
+    if len(set(hole_codes + board_codes)) != len(hole_codes) + len(board_codes):
+        raise ValueError("Duplicate cards in hole cards and board")
+    dead_codes = [card_code(card) for card in dead_cards]
+    if len(live_cards(hole_codes + board_codes + dead_codes)) < 5 - len(board_codes) + 2 * num_opponents:
+        raise ValueError("Not enough live cards for the requested number of opponents")
+    return hole_codes, board_codes, dead_codes
+
+# Esito di una mano completa: 0 = vittoria, 1 = pareggio, 2 = sconfitta
+def showdown_outcome(hole_codes, full_board, opponent_holes):
+    hero = evaluate(hole_codes + full_board)
+    best_opponent = max(evaluate(opponent + full_board) for opponent in opponent_holes)
+    if hero > best_opponent:
+        return 0
+    if hero == best_opponent:
+        return 1
+    return 2
+
+# Esegue fino a iterations simulazioni (o fino alla scadenza) e restituisce [vittorie, pareggi, sconfitte]
+def simulate(hole_codes, board_codes, num_opponents, iterations, rng, deadline=None, dead_codes=()):
+    tallies = [0, 0, 0]
+    deck = CardStack(live_cards(hole_codes + board_codes + list(dead_codes)))
+    missing = 5 - len(board_codes)
+    needed = missing + 2 * num_opponents
+    sample = deck.sample
+
+    for _ in range(iterations):
+        drawn = sample(needed, rng)
+        full_board = board_codes + drawn[:missing]
+        opponent_holes = [drawn[i:i + 2] for i in range(missing, needed, 2)]
+        tallies[showdown_outcome(hole_codes, full_board, opponent_holes)] += 1
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+    return tallies
+
+# Stima del lavoro dell'enumerazione esatta, in valutazioni di mani: per ogni completamento del board
+# si valuta ogni possibile mano avversaria una volta sola, poi si confrontano (molto più economico)
+# tutti gli insiemi non ordinati di mani avversarie
+def exact_cost(live_count, missing, num_opponents):
+    remaining = live_count - missing
+    opponent_sets = 1
+    for i in range(num_opponents):
+        opponent_sets *= comb(remaining - 2 * i, 2)
+    opponent_sets //= factorial(num_opponents)
+    runouts = comb(live_count, missing)
+    return runouts * (comb(remaining, 2) + 1) + runouts * opponent_sets // COMPARISONS_PER_EVALUATION
+
+# Stima del lavoro di Monte Carlo, in valutazioni di mani
+def sampled_cost(iterations, num_opponents):
+    return iterations * (num_opponents + 1)
+
+# Conta gli esiti di tutti gli insiemi disgiunti di mani avversarie (in ordine di indice per non ripeterli).
+# Con deadline controlla la scadenza a ogni mano del primo avversario e restituisce False se è passata.
+def tally_opponent_sets(hero, hands, strengths, num_opponents, tallies, start=0, used=0, best=-1, deadline=None):
+    if num_opponents == 0:
+        tallies[0 if hero > best else 1 if hero == best else 2] += 1
+        return True
+    for index in range(start, len(hands)):
+        if deadline is not None and time.perf_counter() > deadline:
+            return False
+        mask = hands[index]
+        if mask & used:
+            continue
+        tally_opponent_sets(hero, hands, strengths, num_opponents - 1, tallies,
+                            index + 1, used | mask, max(best, strengths[index]))
+    return True
+
+# Enumera esattamente ogni completamento del board e ogni combinazione di mani avversarie.
+# Restituisce None se la scadenza (deadline, da time.perf_counter) arriva prima della fine.
+def enumerate_exact(hole_codes, board_codes, num_opponents, dead_codes=(), deadline=None):
+    tallies = [0, 0, 0]
+    deck = live_cards(hole_codes + board_codes + list(dead_codes))
+    missing = 5 - len(board_codes)
+
+    for runout in combinations(deck, missing):
+        if deadline is not None and time.perf_counter() > deadline:
+            return None
+        full_board = board_codes + list(runout)
+        hero = evaluate(hole_codes + full_board)
+        rest = [code for code in deck if code not in runout]
+        pairs = list(combinations(rest, 2))
+        strengths = [evaluate([a, b] + full_board) for a, b in pairs]
+        if num_opponents == 1:
+            for strength in strengths:
+                tallies[0 if hero > strength else 1 if hero == strength else 2] += 1
+        else:
+            hands = [(1 << a) | (1 << b) for a, b in pairs]
+            if not tally_opponent_sets(hero, hands, strengths, num_opponents, tallies, deadline=deadline):
+                return None
+    return tallies
+
+# Converte i conteggi in probabilità di vittoria, pareggio e sconfitta
+def equity_result(tallies, mode='sampled'):
+    total = sum(tallies)
+    if total == 0:
+        return {'win': 0.0, 'tie': 0.0, 'loss': 0.0, 'iterations': 0, 'mode': mode}
+    return {
+        'win': tallies[0] / total,
+        'tie': tallies[1] / total,
+        'loss': tallies[2] / total,
+        'iterations': total,
+        'mode': mode
+    }
+
+# Simulazione di una porzione delle iterazioni in un processo separato:
+# riceve e restituisce solo interi, così tra i processi non viaggiano oggetti Card
+def simulate_shard(hole_codes, board_codes, num_opponents, iterations, seed, time_budget=None, dead_codes=()):
+    deadline = time.perf_counter() + time_budget if time_budget is not None else None
+    return simulate(hole_codes, board_codes, num_opponents, iterations, random.Random(seed), deadline, dead_codes)
+
+# Seed derivati dal seed principale, uno per porzione: stessi seed e workers danno gli stessi risultati
+def derive_seeds(seed, count):
+    master = random.Random(seed)
+    return [master.getrandbits(64) for _ in range(count)]
+
+# Divide le iterazioni tra i processi e somma i conteggi di ciascuno
+def simulate_parallel(hole_codes, board_codes, num_opponents, iterations, seed, time_budget, workers, executor=None,
+                      dead_codes=()):
+    shard_sizes = [iterations // workers + (1 if i < iterations % workers else 0) for i in range(workers)]
+    seeds = derive_seeds(seed, workers)
+
+    def run(pool):
+        futures = [
+            pool.submit(simulate_shard, hole_codes, board_codes, num_opponents, size, shard_seed, time_budget, dead_codes)
+            for size, shard_seed in zip(shard_sizes, seeds) if size > 0
+        ]
+        tallies = [0, 0, 0]
+        for future in futures:
+            for i, count in enumerate(future.result()):
+                tallies[i] += count
+        return tallies
+
+    if executor is not None:
+        return run(executor)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return run(pool)
+
+# Calcola l'equity delle carte personali contro num_opponents avversari con carte casuali.
+# iterations limita il numero di simulazioni, time_budget (in secondi) il tempo totale.
+# Con workers > 1 le simulazioni vengono divise su più processi (eventualmente un executor già avviato).
+# mode: 'exact' enumera tutti gli esiti, 'sampled' usa Monte Carlo, 'auto' enumera quando
+# costa meno delle iterazioni richieste (tipicamente al turn e al river).
+# time_budget vale anche per l'enumerazione (in entrambi i modi): ha a disposizione metà del tempo e,
+# se non finisce, si passa a Monte Carlo per la metà restante; il risultato riporta allora mode 'sampled'.
+def equity(hole_cards, board=(), num_opponents=1, iterations=DEFAULT_ITERATIONS, seed=None, time_budget=None,
+           workers=1, executor=None, mode='auto', dead_cards=()):
+    hole_codes, board_codes, dead_codes = validate(hole_cards, board, num_opponents, dead_cards)
+    if mode not in ('auto', 'exact', 'sampled'):
+        raise ValueError(f"Unknown equity mode: {mode}")
+
+    if mode == 'auto':
+        live_count = len(live_cards(hole_codes + board_codes + dead_codes))
+        cost = exact_cost(live_count, 5 - len(board_codes), num_opponents)
+        mode = 'exact' if cost <= sampled_cost(iterations, num_opponents) else 'sampled'
+    if mode == 'exact':
+        deadline = time.perf_counter() + time_budget / 2 if time_budget is not None else None
+        tallies = enumerate_exact(hole_codes, board_codes, num_opponents, dead_codes, deadline)
+        if tallies is not None:
+            return equity_result(tallies, mode)
+        time_budget = max(deadline + time_budget / 2 - time.perf_counter(), 0.0)
+
+    if workers > 1:
+        tallies = simulate_parallel(hole_codes, board_codes, num_opponents, iterations, seed, time_budget, workers,
+                                    executor, dead_codes)
+        return equity_result(tallies)
+    rng = random.Random(seed)
+    deadline = time.perf_counter() + time_budget if time_budget is not None else None
+    return equity_result(simulate(hole_codes, board_codes, num_opponents, iterations, rng, deadline, dead_codes))
@@ -0,0 +1,45 @@
+import json
+import threading
+
+# Notifiche del motore di gioco: la partita pubblica gli eventi (turno, azioni, fasi, stato)
+# e chi è interessato (il server Flask, un client da terminale, i test) si iscrive,
+# senza che il motore debba sapere se e come vengono recapitati.
+
+TURN = 'turn'
+ACTION = 'action'
+PHASE = 'phase'
+STATE = 'state'
+DEAL = 'deal'
+
+class EventBus:
+    def __init__(self):
+        self.subscribers = ()
+        self.lock = threading.Lock()
+        self.version = 0  # Numero di eventi pubblicati: versione dello stato della partita
+
+    # Iscrive callback(event), dove event è un dizionario {'type': ..., 'data': ...}
+    def subscribe(self, callback):
+        with self.lock:
+            self.subscribers = self.subscribers + (callback,)
+        return callback
+
+    def unsubscribe(self, callback):
+        with self.lock:
+            self.subscribers = tuple(subscriber for subscriber in self.subscribers if subscriber is not callback)
+
+    def has_subscribers(self):
+        return bool(self.subscribers)
+
+    # Recapita l'evento a tutti gli iscritti nello stesso thread
+    def publish(self, event_type, data):
+        self.version += 1
+        subscribers = self.subscribers
+        if not subscribers:
+            return
+        event = {'type': event_type, 'data': data}
+        for callback in subscribers:
+            callback(event)
+
+# Formatta un evento numerato (con 'id') come messaggio Server-Sent Events
+def format_sse(event):
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
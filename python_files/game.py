@@ -1,14 +1,20 @@
-import random
-from venv import logger
-import requests
+import logging
 
-from players import BotType, Player, Dealer, Bot, BettingRound
-from python_files.deck import Deck, Card
+from python_files.players import BotType, Player, Dealer, Bot, BettingRound
+from python_files.deck import Deck, Card, to_card
 from python_files.poker_rules import PokerRules
+from python_files.events import EventBus, TURN, ACTION, PHASE, STATE, DEAL
+from python_files.metrics import timed, counter
+from python_files.rng import make_rng, spawn
+
+HANDS_COMPLETED = counter('hands_completed', "Hands that reached the showdown")
+
+logger = logging.getLogger(__name__)
 
 class TurnManager:
-    def __init__(self, players):
+    def __init__(self, players, events=None):
         self.players = players
+        self.events = events if events is not None else EventBus()
         self.current_turn = self.find_big_blind()
 
     def find_big_blind(self):
@@ -19,24 +25,16 @@ class TurnManager:
 
     def next_turn(self):
         self.current_turn = (self.current_turn + 1) % len(self.players)
-        print(f"Advancing to the next turn: {self.players[self.current_turn].name}'s turn")
+        logger.debug("Advancing to the next turn: %s's turn", self.players[self.current_turn].name)
+        self.notify_turn()
         return self.get_current_player()
 
     def get_current_player(self):
         return self.players[self.current_turn]
 
-    def send_turn_to_flask(self):
-        current_player = self.get_current_player()
-        data = {'current_turn': current_player.name}
-        print(f"Sending turn to Flask: {data}")  # Aggiungi un log per il debug
-        try:
-            response = requests.post('http://localhost:5001/advance-turn', json=data)
-            if response.status_code == 200:
-                print("Turn information sent successfully")
-            else:
-                print(f"Failed to send turn information: {response.status_code}")
-        except requests.exceptions.RequestException as e:
-            print(f"Error sending turn information: {e}")
+    # Notifica agli iscritti di chi è il turno
+    def notify_turn(self):
+        self.events.publish(TURN, {'current_turn': self.get_current_player().name})
 
 class Game:
     PRE_FLOP = 'pre-flop'
@@ -47,11 +45,19 @@ class Game:
 
     VALID_ACTIONS = ['check', 'call', 'bet', 'raise', 'fold']
 
-    def __init__(self):
-        num_players = random.randint(2, 10)
-        self.deck = Deck('deck.json').deck_data
-        self.dealer = Dealer("dealer")
-        self.players = self.create_players(num_players)
+    # headless: partita senza client da aggiornare (simulazioni bot contro bot)
+    # bot_types: tipi dei bot seduti al tavolo, senza giocatore umano
+    # seed / rng: flusso casuale del tavolo, da cui derivano quelli del mazzo e dei bot (vedi python_files.rng)
+    def __init__(self, num_players=None, headless=False, bot_types=None, seed=None, rng=None):
+        self.rng = rng if rng is not None else make_rng(seed)
+        if bot_types:
+            num_players = len(bot_types)
+        elif num_players is None:
+            num_players = self.rng.randint(2, 10)
+        self.headless = headless
+        self.deck = Deck('deck.json', spawn(self.rng))  # Carte canoniche mescolate, distribuite con un cursore
+        self.dealer = Dealer("dealer", self.deck)
+        self.players = self.create_players(num_players, bot_types)
         self.community_cards = []
         self.turn_count = 0
         self.phase = Game.PRE_FLOP
@@ -61,33 +67,92 @@ class Game:
         self.small_blind, self.big_blind = self.set_blinds()
         self.players_actions = []
         self.blinds_info = {'small_blind': None, 'big_blind': None}
-        self.turn_manager = TurnManager(self.players)
+        self.events = EventBus()
+        self.base_version = 0  # Ultima versione della partita precedente dello stesso tavolo (vedi continue_versions)
+        self.turn_manager = TurnManager(self.players, self.events)
+        self.best_hands = None
+        self.winning_hand_explanation = None
+        # Versione in cui è cambiato ogni elemento dello stato, per le risposte incrementali
+        self.action_log = []
+        self.card_versions = []
+        self.chip_versions = {}
+        self.known_chips = {}
+        # Posti del tavolo con nome e fiches iniziali, per new_hand (setup_players rinomina i bui)
+        self.seats = [(player, player.name, player.chips) for player in self.players]
+
+    # Nuova mano allo stesso tavolo senza ricreare giocatori, mazzo e regole (simulazioni headless):
+    # ogni posto torna al tavolo con nome e fiches iniziali e il mazzo viene rimescolato.
+    # Con rng, come per una partita nuova, si rimescolano i posti, si estraggono i bui e i flussi casuali
+    # di mazzo e bot vengono derivati da rng.
+    def new_hand(self, rng=None):
+        seats = list(self.seats)
+        if rng is not None:
+            self.rng = rng
+            self.deck.rng = spawn(rng)
+            for player, _, _ in seats:
+                if isinstance(player, Bot):
+                    player.rng = spawn(rng)
+                    player.aggressiveness = player.rng.uniform(0.1, 0.9)
+            rng.shuffle(seats)
+            self.small_blind, self.big_blind = self.set_blinds()
+        self.players[:] = [player for player, _, _ in seats]  # Stessa lista del TurnManager
+        for player, name, chips in seats:
+            player.name = name
+            player.chips = chips
+            player.cards = []
+            player.current_bet = 0
+            player.reset_has_acted()
+            player.clear_hand_state()
+            if isinstance(player, Bot):
+                player.actions = []
+        self.deck.reset()
+        self.community_cards = []
+        self.turn_count = 0
+        self.phase = Game.PRE_FLOP
+        self.pot = 0
+        self.current_bet = 0
+        self.players_actions = []
+        self.blinds_info = {'small_blind': None, 'big_blind': None}
+        self.best_hands = None
+        self.winning_hand_explanation = None
+        self.action_log = []
+        self.card_versions = []
+        self.chip_versions = {}
+        self.known_chips = {}
+        self.turn_manager.current_turn = self.turn_manager.find_big_blind()
+
+    def create_players(self, num_players, bot_types=None):
+        if bot_types:
+            all_players = [Bot(f"Bot{i+1}", bot_type, spawn(self.rng)) for i, bot_type in enumerate(bot_types)]
+            self.rng.shuffle(all_players)
+            return all_players
 
-    def create_players(self, num_players):
         players = [Player("player")]
         bot_types = [BotType.AGGRESSIVE, BotType.CONSERVATIVE, BotType.BLUFFER]
-        bots = [Bot(f"Bot{i+1}", random.choice(bot_types)) for i in range(num_players - 1)]
+        bots = [Bot(f"Bot{i+1}", self.rng.choice(bot_types), spawn(self.rng)) for i in range(num_players - 1)]
         all_players = players + bots
-        random.shuffle(all_players)
+        self.rng.shuffle(all_players)
     
         # Debug: verifica che "player" sia presente
         player_names = [player.name for player in all_players]
         if "player" not in player_names:
-            print("Errore: Il giocatore umano 'player' non è nella lista dei giocatori!")
+            logger.error("Il giocatore umano 'player' non è nella lista dei giocatori!")
         else:
-            print(f"Giocatori dopo il mescolamento: {player_names}")
+            logger.debug("Giocatori dopo il mescolamento: %s", player_names)
     
         return all_players
 
     def set_blinds(self):
-        small_blind = random.randint(1, 5) * 5
+        small_blind = self.rng.randint(1, 5) * 5
         big_blind = small_blind * 2
         return small_blind, big_blind
 
     def setup_players(self):
         self.deal_hole_cards()
         self.post_blinds()
-        print(f"Deck after dealing hole cards: {len(self.deck)}")  # Debugging
+        self.publish(DEAL, {'pot': self.pot, 'blinds_info': {'small_blind': self.players[0].name,
+                                                             'big_blind': self.players[1].name}})
+        logger.debug("Deck after dealing hole cards: %d", len(self.deck))
 
     def post_blinds(self):
         self.rotate_blinds()
@@ -97,74 +162,88 @@ class Game:
         big_blind_player.name = 'big_blind'
         self.pot += small_blind_player.bet_chips(self.small_blind)
         self.pot += big_blind_player.bet_chips(self.big_blind)
-        print(f"{small_blind_player.name} posts small blind: {self.small_blind} chips")
-        print(f"{big_blind_player.name} posts big blind: {self.big_blind} chips")
+        logger.debug("%s posts small blind: %d chips", small_blind_player.name, self.small_blind)
+        logger.debug("%s posts big blind: %d chips", big_blind_player.name, self.big_blind)
 
     def rotate_blinds(self):
         self.players.append(self.players.pop(0))
 
     def deal_hole_cards(self):
         for player in self.players:
-            player.cards = self.deck[:2]
-            self.deck = self.deck[2:]
-        print(f"Deck after dealing hole cards: {len(self.deck)}")
+            player.cards = self.deck.deal(2)
+        logger.debug("Deck after dealing hole cards: %d", len(self.deck))
 
     def move_to_flop(self):
         self.phase = Game.FLOP
         self.turn_manager.current_turn = self.turn_manager.find_big_blind()
         self.deal_flop()
-        print("Moving to the Flop phase")  # Log di debug per monitorare il passaggio di fase
+        logger.debug("Moving to the Flop phase")
 
     def deal_flop(self):
-        self.community_cards = self.deck[:3]
-        self.deck = self.deck[3:]
-        print("Dealt Flop: ", self.community_cards)  # Log di debug per le carte comuni
+        self.community_cards = self.deck.deal(3)
+        self.best_hands = None
+        logger.debug("Dealt Flop: %s", self.community_cards)
 
     def move_to_turn(self):
         self.phase = Game.TURN
         self.turn_manager.current_turn = self.turn_manager.find_big_blind()
         self.deal_turn_card()
-        print("Moving to the Turn phase")  # Log di debug per monitorare il passaggio di fase
+        logger.debug("Moving to the Turn phase")
 
     def deal_turn_card(self):
-        self.community_cards.append(self.deck.pop(0))
-        print("Dealt Turn Card: ", self.community_cards[-1])  # Log di debug per la quarta carta comune
+        self.community_cards.append(self.deck.deal_card())
+        self.best_hands = None
+        logger.debug("Dealt Turn Card: %s", self.community_cards[-1])
 
     def move_to_river(self):
         self.phase = Game.RIVER
         self.turn_manager.current_turn = self.turn_manager.find_big_blind()
         self.deal_river_card()
-        print("Moving to the River phase")  # Log di debug per monitorare il passaggio di fase
+        logger.debug("Moving to the River phase")
 
     def deal_river_card(self):
-        self.community_cards.append(self.deck.pop(0))
-        print("Dealt River Card: ", self.community_cards[-1])  # Log di debug per la quinta carta comune
+        self.community_cards.append(self.deck.deal_card())
+        self.best_hands = None
+        logger.debug("Dealt River Card: %s", self.community_cards[-1])
 
     def move_to_showdown(self):
         self.phase = Game.SHOWDOWN
         self.evaluate_hands()
-        print("Moving to the Showdown phase")  # Log di debug per monitorare il passaggio di fase
+        logger.debug("Moving to the Showdown phase")
 
     def execute_phase(self):
         current_player = self.turn_manager.get_current_player()
         current_player_name = current_player.name if not isinstance(current_player, dict) else current_player['name']
 
-        print(f"Executing phase for player: {current_player_name}")
+        logger.debug("Executing phase for player: %s", current_player_name)
 
         if isinstance(current_player, Bot):
-            action, bet_amount = current_player.make_decision(self.generate_game_state_response(), self.phase)
-            print(f"Bot {current_player_name}: decision={action}, bet_amount={bet_amount}")
+            action, bet_amount = current_player.make_decision(self.bot_game_state(), self.phase)
+            logger.debug("Bot %s: decision=%s, bet_amount=%s", current_player_name, action, bet_amount)
             self.execute_turn(current_player, action, bet_amount)
         else:
-            print(f"Player {current_player_name} is making a decision.")
-            self.turn_manager.send_turn_to_flask()
+            logger.debug("Player %s is making a decision.", current_player_name)
+            self.turn_manager.notify_turn()
 
         if self.check_phase_end():
             self.next_phase()  # Passa alla fase successiva se la fase corrente è finita
 
         self.turn_manager.next_turn()
-        print(f"New turn: {self.turn_manager.current_turn}")
-        self.update_client_state()  # Invia lo stato del gioco al client
+        logger.debug("New turn: %d", self.turn_manager.current_turn)
+        self.publish_state()  # Invia lo stato del gioco agli iscritti
+
+    # Fa giocare i bot finché non tocca al giocatore umano o la mano non arriva allo showdown;
+    # le loro mosse raggiungono i client tramite gli eventi pubblicati
+    def play_bot_turns(self, max_actions=100):
+        actions = 0
+        while self.phase != Game.SHOWDOWN and actions < max_actions:
+            bot = self.turn_manager.get_current_player()
+            if not isinstance(bot, Bot):
+                break
+            action, bet_amount = bot.make_decision(self.bot_game_state(), self.phase)
+            self.execute_turn(bot, action, bet_amount)
+            actions += 1
+        return actions
 
     def start_game(self):
         while self.phase != Game.SHOWDOWN:
@@ -172,33 +251,52 @@ class Game:
             if self.check_phase_end():
                 self.next_phase()
         winner = self.get_winner()
-        print(winner)
+        logger.info(winner)
+
+    # Versione corrente dello stato: cresce a ogni evento pubblicato dalla partita
+    @property
+    def state_version(self):
+        return self.events.version
+
+    # Nuova mano allo stesso tavolo: le versioni proseguono da quelle della partita precedente invece di
+    # ripartire da 0, così un since ricevuto durante la mano precedente non coincide mai con una versione
+    # di questa e il client riceve lo stato completo invece di differenze calcolate sulla partita sbagliata
+    def continue_versions(self, previous):
+        self.base_version = previous.state_version
+        self.events.version += self.base_version
+
+    # Pubblica un evento e registra in quale versione sono cambiate carte comuni e fiches
+    def publish(self, event_type, data):
+        self.events.publish(event_type, data)
+        version = self.state_version
+        self.card_versions.extend([version] * (len(self.community_cards) - len(self.card_versions)))
+        for player in self.players:
+            if self.known_chips.get(player.name) != player.chips:
+                self.known_chips[player.name] = player.chips
+                self.chip_versions[player.name] = version
 
-    def update_client_state(self):
-        response = self.generate_game_state_response()
-        try:
-            # Debug: verifica che il dizionario sia serializzabile
-            import json
-            print("Verificando la serializzabilità dello stato del gioco...")
-            print(json.dumps(response, indent=4))  # Stampa lo stato per verificare eventuali errori
-
-            # Invia lo stato aggiornato al server
-            requests.post('http://localhost:5001/update-state', json=response)
-        except TypeError as e:
-            print(f"Errore di serializzazione: {e}")
-        except requests.exceptions.RequestException as e:
-            print(f"Errore durante l'aggiornamento dello stato del client: {e}")
+    # Pubblica lo stato completo del gioco (calcolato solo se qualcuno è iscritto)
+    def publish_state(self):
+        if self.headless or not self.events.has_subscribers():
+            return
+        self.events.publish(STATE, self.generate_game_state_response())
 
+    @timed('execute_turn', "Time spent in Game.execute_turn")
     def execute_turn(self, player, action, bet_amount=0):
-        print("Executing turn:", player.name, "-> action:", action, "bet amount:", bet_amount)  # Debugging
+        player_name = player['name'] if isinstance(player, dict) else player.name
 
         if action in ['string bet', 'angle shooting', 'collusion']:
-            print(f"Invalid action: {action} by {player['name']}")
+            logger.warning("Invalid action: %s by %s", action, player_name)
             return
 
-        player_name = player['name'] if isinstance(player, dict) else player.name
-        print(f"Executing turn: {player_name} -> action: {action}, bet amount: {bet_amount}")
+        # Puntata o rilancio senza importo: rifiutati prima di modificare lo stato, il turno non passa
+        if action in ('bet', 'raise') and bet_amount <= 0:
+            logger.warning("Invalid %s amount: %s by %s", action, bet_amount, player_name)
+            return f"{player_name} cannot {action} {bet_amount} chips"
+
+        logger.debug("Executing turn: %s -> action: %s, bet amount: %s", player_name, action, bet_amount)
 
+        message = f"{player_name}: {action}"  # Giocatore non più al tavolo: l'azione viene solo registrata
         if action in Game.VALID_ACTIONS:
             player_obj = next((p for p in self.players if p.name == player_name), None)
             if player_obj:
@@ -208,14 +306,15 @@ class Game:
                 message = f"{player_name} folds"
                 if player_obj:
                     self.players.remove(player_obj)
+                    self.best_hands = None
 
-            elif action == 'bet' and bet_amount > 0:
+            elif action == 'bet':
                 if player_obj:
                     self.pot += player_obj.bet_chips(bet_amount)
                     self.current_bet = bet_amount
                     message = f"{player_name} bets: {bet_amount} chips"
 
-            elif action == 'raise' and bet_amount > 0:
+            elif action == 'raise':
                 if player_obj:
                     raise_amount = bet_amount - self.current_bet
                     self.pot += player_obj.bet_chips(raise_amount)
@@ -232,65 +331,73 @@ class Game:
                 message = f"{player_name} checks"
 
             self.players_actions.append((player_name, action, bet_amount))
+            self.publish(ACTION, {'player': player_name, 'action': action, 'bet_amount': bet_amount,
+                                  'pot': self.pot, 'message': message})
+            self.action_log.append({'version': self.state_version, 'player': player_name, 'action': action,
+                                    'bet_amount': bet_amount})
 
-            if player_obj:
-                all_cards = self.combine_hands(player_obj.cards)
-                player_hand_strength = self.poker_rules.calculate_hand_ranking(all_cards)
-                print(f"Player {player_name}'s hand strength: {player_hand_strength}")
+            if player_obj and logger.isEnabledFor(logging.DEBUG):
+                player_hand_strength = player_obj.evaluate_hand(self.community_cards)
+                logger.debug("Player %s's hand strength: %s", player_name, player_hand_strength)
 
-        print(f"Turn completed: {player_name} -> action: {action}, pot: {self.pot}, current_bet: {self.current_bet}")
+        logger.debug("Turn completed: %s -> action: %s, pot: %d, current_bet: %d",
+                     player_name, action, self.pot, self.current_bet)
 
         if self.check_phase_end():  # Verifica se la fase è finita dopo il turno
             self.next_phase()       # Passa alla fase successiva se la fase corrente è finita
 
         self.turn_manager.next_turn()  # Avanza al turno successivo
-        print(f"New turn: {self.turn_manager.current_turn}")
+        logger.debug("New turn: %d", self.turn_manager.current_turn)
         return message
 
     def check_phase_end(self):
-        print("Checking if all players have acted:")
-        for player in self.players:
-            print(f"Player {player.name} has_acted: {player.has_acted}")
-
         if len(self.players) == 1:  # Se rimane solo un giocatore, vince automaticamente
-            print(f"Only one player remaining: {self.players[0].name}")
+            logger.debug("Only one player remaining: %s", self.players[0].name)
             self.phase = Game.SHOWDOWN
             return True
 
         if self.all_players_acted():
-            print("All players have acted. Moving to the next phase.")
+            logger.debug("All players have acted. Moving to the next phase.")
             return True
         else:
-            print("Not all players have acted yet.")
+            logger.debug("Not all players have acted yet.")
             return False
 
     def all_players_acted(self):
         result = all(player.has_acted for player in self.players)
-        print(f"all_players_acted: {result} (Players: {[player.name for player in self.players]})")  # Log di debug
-        for player in self.players:
-            print(f"{player.name} has_acted: {player.has_acted}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("all_players_acted: %s (has_acted: %s)", result,
+                         {player.name: player.has_acted for player in self.players})
         return result
 
-    def evaluate_hands(self):
-        best_hands = {}
-        for player in self.players:
-            player_hand = self.combine_hands(player.cards)
-            best_hands[player.name] = self.poker_rules.get_best_hand(player_hand)
+    # Valuta una sola volta la migliore mano di ogni giocatore: (forza, cinque carte) per nome
+    def get_best_hands(self):
+        if self.best_hands is None:
+            self.best_hands = {
+                player.name: self.poker_rules.evaluate_best_hand(self.combine_hands(player.cards))
+                for player in self.players
+            }
+        return self.best_hands
 
-        winner = max(best_hands, key=lambda name: self.poker_rules.calculate_hand_ranking(best_hands[name]))
-        winner_hand = self.poker_rules.hand_name(best_hands[winner])
-        winning_hand = best_hands[winner]
+    # Nomi di tutti i giocatori con la mano più forte (più di uno se il piatto va diviso)
+    def get_winners(self):
+        best_hands = self.get_best_hands()
+        best_strength = max(strength for strength, _ in best_hands.values())
+        return [name for name, (strength, _) in best_hands.items() if strength == best_strength]
+
+    def evaluate_hands(self):
+        winners = self.get_winners()
+        winning_hand = self.get_best_hands()[winners[0]][1]
+        winner_hand = self.poker_rules.hand_name(winning_hand)
         self.winning_hand_explanation = self.poker_rules.get_hand_explanation(winning_hand)
-        print(f"{winner} wins with {winner_hand} and wins {self.pot} chips!")
+        HANDS_COMPLETED.inc()
+        if len(winners) == 1:
+            logger.info("%s wins with %s and wins %d chips!", winners[0], winner_hand, self.pot)
+        else:
+            logger.info("Split pot between %s with %s: %d chips", ', '.join(winners), winner_hand, self.pot)
 
     def combine_hands(self, player_cards):
-        all_cards = []
-        for card in player_cards + self.community_cards:
-            if isinstance(card, dict):
-                all_cards.append(Card(card['value'], card['suit']))
-            else:
-                all_cards.append(card)
-        return all_cards
+        return [to_card(card) for card in player_cards + self.community_cards]
 
     def start_game(self):
         while self.phase != Game.SHOWDOWN:
@@ -298,7 +405,7 @@ class Game:
             if self.check_phase_end():
                 self.next_phase()
         winner = self.get_winner()
-        print(winner)
+        logger.info(winner)
 
     def next_phase(self):
         if self.phase == Game.PRE_FLOP:
@@ -311,30 +418,42 @@ class Game:
             self.move_to_showdown()
 
         # Reset dello stato has_acted di tutti i giocatori dopo ogni fase
+        # e aggiornamento delle mani memorizzate con le nuove carte comuni
         for player in self.players:
             player.reset_has_acted()
+            player.update_hand_state(self.community_cards)
 
-        print(f"Next phase: {self.phase}")
+        logger.debug("Next phase: %s", self.phase)
+        self.publish(PHASE, {'phase': self.phase, 'community_cards': self.format_hand(self.community_cards),
+                             'pot': self.pot})
 
     def get_winner(self):
-        best_hands = {}
-        for player in self.players:
-            player_hand = self.combine_hands(player.cards)
-            best_hands[player.name] = self.poker_rules.get_best_hand(player_hand)
-
-        winner = max(best_hands, key=lambda name: self.poker_rules.calculate_hand_ranking(best_hands[name]))
-        winner_hand = self.poker_rules.hand_name(best_hands[winner])
-        return f"{winner} wins with {winner_hand}!"
+        winners = self.get_winners()
+        winner_hand = self.poker_rules.hand_name(self.get_best_hands()[winners[0]][1])
+        if len(winners) == 1:
+            return f"{winners[0]} wins with {winner_hand}!"
+        return f"Split pot between {', '.join(winners)} with {winner_hand}!"
+
+    # Assegna il piatto ai vincitori, dividendolo in parti uguali in caso di parità
+    def award_pot(self):
+        winner_names = set(self.get_winners())
+        winners = [player for player in self.players if player.name in winner_names]
+        share, remainder = divmod(self.pot, len(winners))
+        for winner in winners:
+            winner.add_chips(share)
+        winners[0].add_chips(remainder)
+        self.pot = 0
+        return winners
 
     def assign_turns(self):
-        starting_player = random.choice(self.players)
-        print(f"Starting player: {starting_player.name}")
+        starting_player = self.rng.choice(self.players)
+        logger.debug("Starting player: %s", starting_player.name)
         self.current_turn = starting_player.name
         return self.current_turn
 
     def assign_blinds(self):
         players = self.players[:]
-        random.shuffle(players)
+        self.rng.shuffle(players)
         self.blinds_info['small_blind'] = players[0].name
         self.blinds_info['big_blind'] = players[1].name
         return self.blinds_info
@@ -346,15 +465,23 @@ class Game:
                 bot_actions.extend(player.get_actions())
         return bot_actions
 
-    def generate_game_state_response(self):
-        # Debug: verifica i giocatori presenti
-        print(f"Stato corrente dei giocatori: {[player.name for player in self.players]}")
+    # Stato minimo necessario alle decisioni dei bot, senza serializzare tutto il tavolo
+    def bot_game_state(self):
+        return {
+            'community_cards': self.community_cards,
+            'current_bet': self.current_bet,
+            'pot': self.pot,
+            'players': self.players,
+            'dealer_index': self.turn_manager.find_big_blind()
+        }
 
+    @timed('state_response', "Time to build the full game state (Game.generate_game_state_response)")
+    def generate_game_state_response(self):
         try:
             player_index = next(i for i, p in enumerate(self.players) if p.name == 'player')
             player_hand = self.format_hand(self.players[player_index].cards)
         except StopIteration:
-            print("Nessun giocatore con il nome 'player' trovato. Verifica se la lista self.players è popolata correttamente.")
+            logger.debug("Nessun giocatore con il nome 'player' al tavolo")
             player_hand = []  # Gestisce il caso in cui non esista un giocatore con il nome 'player'
 
         dealer_hand = self.format_hand(self.dealer.cards) if self.phase == Game.SHOWDOWN else [{'value': 'back', 'suit': 'card_back'}] * 2
@@ -394,17 +521,44 @@ class Game:
             'current_bet': self.current_bet,
             'players': players_info,
             'dealer_index': self.turn_manager.find_big_blind(),  # Aggiungi questa riga
-            'bot_actions': bot_actions
+            'bot_actions': bot_actions,
+            'version': self.state_version
         }
 
-        # Debug: stampa lo stato del gioco generato
-        print(f"Stato del gioco generato: {response}")
+        logger.debug("Stato del gioco generato: %s", response)
+        return response
+
+    # Solo ciò che è cambiato dopo la versione since: nuove azioni, nuove carte comuni, fiches cambiate.
+    # Se since non appartiene a questa partita (ad esempio è di una mano precedente) restituisce lo stato completo.
+    def generate_state_delta(self, since):
+        version = self.state_version
+        if since is None or not self.base_version < since <= version:
+            return self.generate_game_state_response()
+
+        new_cards = [card for card, card_version in zip(self.community_cards, self.card_versions) if card_version > since]
+        response = {
+            'version': version,
+            'since': since,
+            'phase': self.phase,
+            'pot': self.pot,
+            'current_bet': self.current_bet,
+            'current_turn': self.players[self.turn_manager.current_turn].name,
+            'actions': [entry for entry in self.action_log if entry['version'] > since],
+            'new_community_cards': self.format_hand(new_cards),
+            'players': [player.to_dict() for player in self.players if self.chip_versions.get(player.name, 0) > since],
+            'active_players': [player.name for player in self.players]
+        }
+        if self.phase == Game.SHOWDOWN:
+            response['winner'] = self.get_winner()
+            response['winning_hand'] = self.winning_hand_explanation
         return response
 
     def format_hand(self, cards):
         return [{'value': card.value, 'suit': card.suit} for card in cards]
 
 if __name__ == "__main__":
+    from python_files.logging_config import configure_logging
+    configure_logging('INFO')
     game = Game()
     game.setup_players()
     game.start_game()
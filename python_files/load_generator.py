@@ -0,0 +1,75 @@
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+# Prova di carico delle API del tavolo: ogni client virtuale gioca al proprio tavolo
+# inviando azioni a /action e misura la latenza di ogni richiesta.
+# Con il server avviato (Flask o ASGI):  python -m python_files.load_generator --clients 50 --requests 2000
+
+DEFAULT_URL = 'http://localhost:5001'
+
+# Percentile p (0-100) delle latenze già ordinate
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+# Un client: crea il proprio tavolo e invia azioni finché non ha esaurito la sua quota di richieste
+def run_client(base_url, n_requests, latencies, errors, lock):
+    session = requests.Session()
+    table_id = session.post(f"{base_url}/start-game").json()['table_id']
+    version = None
+    for _ in range(n_requests):
+        payload = {'table_id': table_id, 'action': 'call', 'betAmount': 0}
+        if version is not None:
+            payload['since'] = version
+        start = time.perf_counter()
+        response = session.post(f"{base_url}/action", json=payload)
+        elapsed = time.perf_counter() - start
+        state = response.json() if response.ok else {}
+        with lock:
+            latencies.append(elapsed)
+            if not response.ok:
+                errors.append(response.status_code)
+        version = state.get('version')
+        if not response.ok or state.get('phase') == 'showdown':
+            state = session.post(f"{base_url}/start-game", json={'table_id': table_id}).json()
+            version = state.get('version')
+
+def run_load(base_url=DEFAULT_URL, clients=10, total_requests=1000):
+    latencies, errors, lock = [], [], threading.Lock()
+    per_client = [total_requests // clients + (1 if i < total_requests % clients else 0) for i in range(clients)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        for future in [pool.submit(run_client, base_url, n, latencies, errors, lock) for n in per_client if n > 0]:
+            future.result()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'seconds': elapsed,
+        'requests_per_second': len(latencies) / elapsed if elapsed > 0 else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test /action and report requests/second and p99 latency")
+    parser.add_argument('--url', default=DEFAULT_URL)
+    parser.add_argument('--clients', type=int, default=10, help="concurrent clients, one table each")
+    parser.add_argument('--requests', type=int, default=1000, help="total /action requests")
+    args = parser.parse_args()
+
+    result = run_load(args.url, args.clients, args.requests)
+    print(f"{result['requests']} /action requests ({result['errors']} errors) in {result['seconds']:.2f}s: "
+          f"{result['requests_per_second']:.0f} req/s, p50 {result['p50_ms']:.1f} ms, p99 {result['p99_ms']:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import json
+import logging
+import os
+
+# Configurazione del logging per server, simulatori e script.
+# Per default si registrano solo avvisi ed errori (WARNING); i livelli si cambiano con le variabili d'ambiente:
+#   POKER_LOG_LEVEL=INFO                                          livello generale
+#   POKER_LOG_LEVELS=python_files.game=DEBUG,python_files.players=INFO   livelli per modulo
+#   POKER_LOG_FORMAT=json                                         una riga JSON per messaggio
+
+DEFAULT_LEVEL = 'WARNING'
+TEXT_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+# Formatta ogni messaggio come un oggetto JSON su una riga
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+# Legge "modulo=LIVELLO,modulo=LIVELLO" in un dizionario
+def parse_module_levels(spec):
+    levels = {}
+    for item in filter(None, (part.strip() for part in (spec or '').split(','))):
+        name, _, level = item.partition('=')
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+# Configura il logger radice e i livelli per modulo; gli argomenti hanno la precedenza sulle variabili d'ambiente
+def configure_logging(level=None, module_levels=None, json_format=None):
+    level = (level or os.environ.get('POKER_LOG_LEVEL') or DEFAULT_LEVEL).upper()
+    if module_levels is None:
+        module_levels = parse_module_levels(os.environ.get('POKER_LOG_LEVELS'))
+    if json_format is None:
+        json_format = os.environ.get('POKER_LOG_FORMAT', '').lower() == 'json'
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(JsonFormatter() if json_format else logging.Formatter(TEXT_FORMAT))
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(level)
+    for name, module_level in module_levels.items():
+        logging.getLogger(name).setLevel(module_level)
+    return root
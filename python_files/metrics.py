@@ -0,0 +1,151 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+
+# Strumentazione dei punti caldi del motore: contatori e istogrammi delle latenze tenuti in memoria
+# ed esposti in formato testo Prometheus (route /metrics dei server).
+# Si attiva con POKER_METRICS=1 (o enable()); da disattivata ogni misura costa un solo controllo di un flag.
+
+PREFIX = 'poker_'
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_enabled = os.environ.get('POKER_METRICS', '0') == '1'
+_metrics = {}
+_lock = threading.Lock()
+
+def enable():
+    global _enabled
+    _enabled = True
+
+def disable():
+    global _enabled
+    _enabled = False
+
+def is_enabled():
+    return _enabled
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1):
+        if not _enabled:
+            return
+        with self.lock:
+            self.value += amount
+
+    def samples(self):
+        return [(f"{self.name}_total", '', self.value)]
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # L'ultimo è il bucket +Inf
+        self.sum = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def samples(self):
+        with self.lock:
+            counts, total = list(self.counts), self.sum
+        samples, cumulative = [], 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            samples.append((f"{self.name}_bucket", f'{{le="{le}"}}', cumulative))
+        samples.append((f"{self.name}_sum", '', total))
+        samples.append((f"{self.name}_count", '', cumulative))
+        return samples
+
+# Restituisce la metrica con quel nome, creandola alla prima richiesta
+def get_metric(cls, name, help_text, **kwargs):
+    full_name = PREFIX + name
+    with _lock:
+        metric = _metrics.get(full_name)
+        if metric is None:
+            metric = _metrics[full_name] = cls(full_name, help_text, **kwargs)
+    return metric
+
+def counter(name, help_text):
+    return get_metric(Counter, name, help_text)
+
+def histogram(name, help_text, buckets=DEFAULT_BUCKETS):
+    return get_metric(Histogram, f"{name}_seconds", help_text, buckets=buckets)
+
+# Cronometra un blocco di codice nell'istogramma indicato: with timer(JSON_SERIALIZATION):
+class timer:
+    __slots__ = ('metric', 'start')
+
+    def __init__(self, metric):
+        self.metric = metric
+
+    def __enter__(self):
+        if _enabled:
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if _enabled:
+            self.metric.observe(time.perf_counter() - self.start)
+        return False
+
+# Decoratore: misura la durata di ogni chiamata della funzione nell'istogramma indicato
+def timed(name, help_text=''):
+    def decorate(function):
+        metric = histogram(name, help_text)
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                metric.observe(time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+# Testo in formato di esposizione Prometheus di tutte le metriche (più eventuali valori istantanei)
+def render(gauges=None):
+    lines = []
+    with _lock:
+        metrics = sorted(_metrics.values(), key=lambda metric: metric.name)
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.help_text}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for sample_name, labels, value in metric.samples():
+            lines.append(f"{sample_name}{labels} {value}")
+    for name, (help_text, value) in sorted((gauges or {}).items()):
+        lines.append(f"# HELP {PREFIX}{name} {help_text}")
+        lines.append(f"# TYPE {PREFIX}{name} gauge")
+        lines.append(f"{PREFIX}{name} {value}")
+    return '\n'.join(lines) + '\n'
+
+# Azzera tutte le metriche (test e benchmark)
+def reset():
+    with _lock:
+        for metric in _metrics.values():
+            with metric.lock:
+                if isinstance(metric, Histogram):
+                    metric.counts = [0] * len(metric.counts)
+                    metric.sum = 0.0
+                else:
+                    metric.value = 0
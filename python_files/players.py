@@ -3,10 +3,17 @@ import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from deck import Card, Deck
+from python_files.deck import Card, Deck, to_card, card_code
+from python_files.hand_evaluator import HandState, hand_category
 from python_files.poker_rules import PokerRules
+from python_files.equity import equity
+from python_files.preflop_table import preflop_equity
+from python_files.metrics import timed
 from enum import Enum
 import random
+import logging
+
+logger = logging.getLogger(__name__)
 
 class Player:
     def __init__(self, name: str):
@@ -17,8 +24,10 @@ class Player:
         self.has_acted = False
         self.current_bet = 0
         self.poker_rules = PokerRules()
+        self.strength_cache = None  # (carte personali, numero di carte comuni, HandState)
 
     def add_card(self, card: Card):
+        card = to_card(card)
         if card not in self.cards:
             self.cards.append(card)
 
@@ -34,13 +43,13 @@ class Player:
 
     def bet_chips(self, amount):
         if amount <= 0:
-            print(f"{self.name} ha tentato di scommettere un importo non valido: {amount}")
+            logger.debug("%s ha tentato di scommettere un importo non valido: %s", self.name, amount)
             return 0
         if amount <= self.chips:
             self.chips -= amount
             self.current_bet += amount
             return amount
-        print(f"{self.name} non ha abbastanza fiches per scommettere {amount}. Fiches disponibili: {self.chips}")
+        logger.debug("%s non ha abbastanza fiches per scommettere %s. Fiches disponibili: %d", self.name, amount, self.chips)
         return 0
 
     def get_chips(self):
@@ -51,15 +60,41 @@ class Player:
 
     def reset_has_acted(self):
         self.has_acted = False
-        print(f"{self.name} has_acted reset to {self.has_acted}")
 
     def set_has_acted(self):
         self.has_acted = True
-        print(f"{self.name} has set has_acted to True")
 
     def evaluate_hand(self, community_cards):
-            all_cards = self.cards + community_cards
-            return self.poker_rules.calculate_hand_ranking(all_cards)
+        return hand_category(self.hand_state(community_cards).strength())
+
+    # Forza completa della mano (categoria e kicker), confrontabile con quella degli altri giocatori
+    def hand_strength(self, community_cards):
+        return self.hand_state(community_cards).strength()
+
+    # Mano del giocatore memorizzata per (carte personali, numero di carte comuni): cambia solo quando si
+    # scopre una nuova strada, e al turn e al river si estende con la sola carta nuova
+    def hand_state(self, community_cards):
+        hole = tuple(card_code(card) for card in self.cards)
+        count = len(community_cards)
+        cache = self.strength_cache
+        if cache is not None and cache[0] == hole:
+            if cache[1] == count:
+                return cache[2]
+            if cache[1] == count - 1:
+                state = cache[2].add(card_code(community_cards[-1]))
+                self.strength_cache = (hole, count, state)
+                return state
+        state = HandState.from_codes(hole + tuple(card_code(card) for card in community_cards))
+        self.strength_cache = (hole, count, state)
+        return state
+
+    # Aggiorna la mano memorizzata dopo che sono state scoperte nuove carte comuni
+    def update_hand_state(self, community_cards):
+        if self.strength_cache is not None:
+            self.hand_state(community_cards)
+
+    def clear_hand_state(self):
+        self.strength_cache = None
     
     def to_dict(self):
         return {
@@ -87,19 +122,25 @@ class Dealer(Player):
 
     def determine_winner(self, players, game_state):
         # Logica per determinare il vincitore basata sulla forza della mano
-        best_hand_strength = 0
-        winner = None
-        for player in players:
-            hand_strength = player.evaluate_hand(game_state['community_cards'])
-            if hand_strength > best_hand_strength:
-                best_hand_strength = hand_strength
-                winner = player
-        return winner
+        winners = self.determine_winners(players, game_state)
+        return winners[0] if winners else None
+
+    def determine_winners(self, players, game_state):
+        # Tutti i giocatori con la mano più forte (più di uno in caso di piatto diviso)
+        return self.poker_rules.determine_winners(players, game_state['community_cards'])
 
     def distribute_winnings(self, winner, game_state):
         winner.add_chips(game_state['pot'])
         game_state['pot'] = 0
 
+    def split_pot(self, winners, game_state):
+        # Divide il piatto in parti uguali; le fiches avanzate vanno al primo vincitore
+        share, remainder = divmod(game_state['pot'], len(winners))
+        for winner in winners:
+            winner.add_chips(share)
+        winners[0].add_chips(remainder)
+        game_state['pot'] = 0
+
 class BettingRound(Enum):
     PRE_FLOP = 1
     FLOP = 2
@@ -117,13 +158,20 @@ class BotType(Enum):
     CALLING_STATION = 8 # Giocatore che chiama frequentemente ma rilancia raramente, anche con mani forti.
 
 class Bot(Player):
-    def __init__(self, name: str, bot_type: BotType):
+    # Tipi di bot che rispettano le pot odds quando l'equity è nota (bluffer, maniaci e calling station le ignorano)
+    EQUITY_AWARE_TYPES = (BotType.AGGRESSIVE, BotType.CONSERVATIVE, BotType.TIGHT, BotType.LOOSE, BotType.PASSIVE)
+
+    # rng: generatore delle decisioni casuali del bot (di default quello globale del modulo random)
+    def __init__(self, name: str, bot_type: BotType, rng=random):
         super().__init__(name)
+        self.rng = rng
         self.poker_rules = PokerRules()
-        self.aggressiveness = random.uniform(0.1, 0.9)
+        self.aggressiveness = rng.uniform(0.1, 0.9)
         self.bot_type = bot_type
         self.current_bet = 0
         self.actions = []
+        self.equity_iterations = 1000  # Budget di simulazioni per ogni stima dell'equity
+        self.equity_time_budget = 0.02  # Tempo massimo (in secondi) per ogni stima dell'equity
 
     def record_action(self, action, bet_amount):
         self.actions.append({'action': action, 'bet_amount': bet_amount})
@@ -131,43 +179,51 @@ class Bot(Player):
     def get_actions(self):
         return self.actions
 
+    @timed('bot_decision', "Time spent in Bot.make_decision, equity estimates included")
     def make_decision(self, game_state, betting_round: BettingRound):
         hand_strength = self.evaluate_hand(game_state['community_cards'])
         pot_odds = self.calculate_pot_odds(game_state)
         opponent_behavior = self.analyze_opponent_behavior(game_state)
         table_position = self.evaluate_table_position(game_state)
 
-        print(f"Bot {self.name}: hand_strength={hand_strength}, pot_odds={pot_odds}, opponent_behavior={opponent_behavior}, table_position={table_position}, betting_round={betting_round}")
+        logger.debug("Bot %s: hand_strength=%s, pot_odds=%s, opponent_behavior=%s, table_position=%s, betting_round=%s",
+                     self.name, hand_strength, pot_odds, opponent_behavior, table_position, betting_round)
 
-        if betting_round == BettingRound.PRE_FLOP:
-            decision, bet_amount = self.pre_flop_decision(hand_strength, pot_odds, opponent_behavior, table_position)
+        if betting_round in (BettingRound.PRE_FLOP, 'pre-flop'):
+            hand_equity = self.pre_flop_equity(game_state)
+            decision, bet_amount = self.pre_flop_decision(hand_strength, pot_odds, opponent_behavior, table_position, hand_equity)
         else:
-            decision, bet_amount = self.post_flop_decision(hand_strength, game_state, pot_odds, opponent_behavior, table_position)
+            hand_equity = self.late_street_equity(game_state)
+            decision, bet_amount = self.post_flop_decision(hand_strength, game_state, pot_odds, opponent_behavior, table_position, hand_equity)
 
         if decision in ['bet', 'raise'] and bet_amount <= 0:
             decision = 'fold'
 
-        print(f"Bot {self.name}: decision={decision}, bet_amount={bet_amount}")
+        logger.debug("Bot %s: decision=%s, bet_amount=%s", self.name, decision, bet_amount)
 
         self.record_action(decision, bet_amount)
 
         return decision, bet_amount
 
-    def pre_flop_decision(self, hand_strength, pot_odds, opponent_behavior, table_position):
-        bet_amount = random.randint(10, 100)
+    def pre_flop_decision(self, hand_strength, pot_odds, opponent_behavior, table_position, hand_equity=None):
+        bet_amount = self.rng.randint(10, 100)
+        if hand_equity is not None and self.bot_type in Bot.EQUITY_AWARE_TYPES and pot_odds > 0:
+            # Davanti a una puntata, lascia la mano se l'equity pre-flop non copre le pot odds
+            if hand_equity < 1 / (pot_odds + 1):
+                return "fold", bet_amount
         if self.bot_type == BotType.AGGRESSIVE:
             if hand_strength >= 3 or pot_odds >= 1.0:
                 self.increase_aggressiveness()
                 return "raise", bet_amount
-            elif random.random() < 0.3:
+            elif self.rng.random() < 0.3:
                 return "bet", bet_amount
         elif self.bot_type == BotType.CONSERVATIVE:
             if hand_strength >= 5 or pot_odds >= 1.5:
                 return "call", bet_amount
-            elif random.random() < 0.2:
+            elif self.rng.random() < 0.2:
                 return "raise", bet_amount
         elif self.bot_type == BotType.BLUFFER:
-            if random.random() < 0.4:
+            if self.rng.random() < 0.4:
                 return "raise", bet_amount
         elif self.bot_type == BotType.TIGHT:
             if hand_strength >= 6 or pot_odds >= 2.0:
@@ -176,7 +232,7 @@ class Bot(Player):
             if hand_strength >= 2 or pot_odds >= 1.0:
                 self.increase_aggressiveness()
                 return "raise", bet_amount
-            elif random.random() < 0.5:
+            elif self.rng.random() < 0.5:
                 return "call", bet_amount
         elif self.bot_type == BotType.PASSIVE:
             if hand_strength >= 4 or pot_odds >= 1.5:
@@ -190,21 +246,25 @@ class Bot(Player):
 
         return "fold", bet_amount
 
-    def post_flop_decision(self, hand_strength, game_state, pot_odds, opponent_behavior, table_position):
-        bet_amount = random.randint(10, 100)
+    def post_flop_decision(self, hand_strength, game_state, pot_odds, opponent_behavior, table_position, hand_equity=None):
+        bet_amount = self.rng.randint(10, 100)
+        if hand_equity is not None and self.bot_type in Bot.EQUITY_AWARE_TYPES and pot_odds > 0:
+            # Davanti a una puntata, lascia la mano se l'equity non copre le pot odds
+            if hand_equity < 1 / (pot_odds + 1):
+                return "fold", bet_amount
         if self.bot_type == BotType.AGGRESSIVE:
             if hand_strength >= 4 or pot_odds >= 1.5:
                 self.increase_aggressiveness()
                 return "raise", bet_amount
-            elif random.random() < 0.4:
+            elif self.rng.random() < 0.4:
                 return "bet", bet_amount
         elif self.bot_type == BotType.CONSERVATIVE:
             if hand_strength >= 6 or pot_odds >= 2.0:
                 return "call", bet_amount
-            elif random.random() < 0.3:
+            elif self.rng.random() < 0.3:
                 return "raise", bet_amount
         elif self.bot_type == BotType.BLUFFER:
-            if random.random() < 0.5:
+            if self.rng.random() < 0.5:
                 return "raise", bet_amount
         elif self.bot_type == BotType.TIGHT:
             if hand_strength >= 6 or pot_odds >= 2.0:
@@ -213,7 +273,7 @@ class Bot(Player):
             if hand_strength >= 2 or pot_odds >= 1.0:
                 self.increase_aggressiveness()
                 return "raise", bet_amount
-            elif random.random() < 0.5:
+            elif self.rng.random() < 0.5:
                 return "call", bet_amount
         elif self.bot_type == BotType.PASSIVE:
             if hand_strength >= 4 or pot_odds >= 1.5:
@@ -227,9 +287,25 @@ class Bot(Player):
 
         return "check", 0
 
-    def evaluate_hand(self, community_cards):
-        all_cards = self.cards + community_cards
-        return self.poker_rules.calculate_hand_ranking(all_cards)
+    def estimate_equity(self, community_cards, num_opponents):
+        # Probabilità di vittoria/pareggio/sconfitta contro avversari con carte casuali, entro i budget del bot
+        return equity(self.cards, community_cards, max(1, num_opponents), iterations=self.equity_iterations,
+                      seed=self.rng.getrandbits(64), time_budget=self.equity_time_budget)
+
+    def pre_flop_equity(self, game_state):
+        # Equity pre-flop (vittorie + metà dei pareggi) letta dalla tabella precalcolata, senza simulazioni
+        if len(self.cards) != 2:
+            return None
+        return preflop_equity(self.cards, len(game_state.get('players', [])) - 1)
+
+    def late_street_equity(self, game_state):
+        # Al turn e al river gli esiti rimasti sono pochi: l'equity (spesso esatta) rende le decisioni più precise
+        community_cards = game_state['community_cards']
+        if len(community_cards) < 4 or len(self.cards) != 2 or self.equity_iterations <= 0:
+            return None
+        num_opponents = min(len(game_state.get('players', [])) - 1, 9)
+        result = self.estimate_equity(community_cards, num_opponents)
+        return result['win'] + result['tie'] / 2
 
     def calculate_pot_odds(self, game_state):
         current_bet = game_state['current_bet']
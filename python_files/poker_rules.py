@@ -1,7 +1,126 @@
-from itertools import combinations
+import os
+import threading
+from collections import OrderedDict
+
+from python_files.deck import card_code
+from python_files.hand_evaluator import evaluate, evaluate_best, hand_category
+from python_files.metrics import timed
+
+DEFAULT_HAND_CACHE_SIZE = int(os.environ.get('POKER_HAND_CACHE_SIZE', 65536))  # 0 disattiva la cache
+
+# Spiegazioni testuali delle combinazioni, indicizzate per punteggio
+HAND_EXPLANATIONS = {
+    10: ("Hand: Royal Flush\n"
+         "The highest straight flush, consisting of the ace, king, queen, jack and ten all of the same suit.\n"
+         "Worth 10 points."),
+    9: ("Hand: Straight Flush\n"
+        "Five consecutive cards of the same suit.\n"
+        "Worth 9 points."),
+    8: ("Hand: Four of a Kind\n"
+        "Four cards of the same rank.\n"
+        "Worth 8 points."),
+    7: ("Hand: Full House\n"
+        "Three of a kind combined with a pair.\n"
+        "Worth 7 points."),
+    6: ("Hand: Flush\n"
+        "Five cards of the same suit, not in sequence.\n"
+        "Worth 6 points."),
+    5: ("Hand: Straight\n"
+        "Five consecutive cards of different suits.\n"
+        "Worth 5 points."),
+    4: ("Hand: Three of a Kind\n"
+        "Three cards of the same rank.\n"
+        "Worth 4 points."),
+    3: ("Hand: Two Pairs\n"
+        "Two different pairs.\n"
+        "Worth 3 points."),
+    2: ("Hand: Pair\n"
+        "Two cards of the same rank.\n"
+        "Worth 2 points."),
+    1: ("Hand: High Card\n"
+        "None of the above combinations.\n"
+        "Worth 1 point."),
+}
+
+# Forma canonica di una mano (carte distinte): i bitmask dei valori di ogni seme, ordinati, e l'ordine dei semi.
+# Le mani che differiscono solo per una permutazione dei semi hanno la stessa chiave e la stessa mano migliore;
+# suit_order[i] è il seme reale che nella forma canonica ha indice i.
+def canonical_form(codes):
+    suit_bits = [0, 0, 0, 0]
+    for code in codes:
+        suit_bits[code & 3] |= 1 << (code >> 2)
+    suit_order = sorted(range(4), key=suit_bits.__getitem__)
+    return tuple(suit_bits[suit] for suit in suit_order), suit_order
+
+# Cache LRU limitata delle mani valutate, condivisa tra i thread del server (accessi protetti da un lock),
+# con il conteggio di successi e fallimenti per regolarne la dimensione
+class HandCache:
+    def __init__(self, maxsize=DEFAULT_HAND_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # Valore memorizzato per la chiave (None se manca); la chiave diventa la più recente
+    def get(self, key):
+        with self.lock:
+            value = self.entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    # Memorizza un valore, scartando le chiavi usate meno di recente oltre maxsize
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def resize(self, maxsize):
+        with self.lock:
+            self.maxsize = maxsize
+            while len(self.entries) > max(maxsize, 0):
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self.entries),
+                'maxsize': self.maxsize,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    # Statistiche nel formato dei valori istantanei di metrics.render
+    def gauges(self):
+        stats = self.stats()
+        return {
+            'hand_cache_hits': ("Best hand cache hits", stats['hits']),
+            'hand_cache_misses': ("Best hand cache misses", stats['misses']),
+            'hand_cache_entries': ("Hands currently in the best hand cache", stats['size'])
+        }
+
 class PokerRules:
+    # Cache delle mani migliori condivisa da tutte le istanze (giocatori, bot e partite dello stesso processo)
+    hand_cache = HandCache()
+
     def __init__(self):
         self.hand_rankings = self.define_hand_rankings()
+        self.hand_names = {points: ranking.replace('_', ' ').title() for ranking, points in self.hand_rankings.items()}
 
     # Definisce le classifiche delle mani nel Texas Hold'em Poker
     def define_hand_rankings(self):
@@ -38,10 +157,17 @@ class PokerRules:
                 suits.append(card.suit)
         return suits
 
+    # Converte la mano nelle codifiche intere delle carte
+    def encode_hand(self, hand):
+        return [card_code(card) for card in hand]
+
+    # Estrae gli indici dei valori (0 = '2', 12 = 'A') dalla mano codificata
+    def extract_ranks(self, hand):
+        return [card_code(card) >> 2 for card in hand]
+
     # Verifica se la mano è una scala reale (Royal Flush)
     def royal_flush(self, hand):
-        card_values = ['10', 'J', 'Q', 'K', 'A']
-        return self.straight_flush(hand) and all(card.value in card_values for card in hand) and len(set(self.extract_suits(hand))) == 1
+        return self.straight_flush(hand) and min(self.extract_ranks(hand)) == 8
 
     # Verifica se la mano è una scala colore (Straight Flush)
     def straight_flush(self, hand):
@@ -49,89 +175,74 @@ class PokerRules:
     
     # Verifica se la mano è un poker (Four of a Kind)
     def four_of_a_kind(self, hand):
-        values = self.extract_values(hand)
-        return any(values.count(value) == 4 for value in values)
+        ranks = self.extract_ranks(hand)
+        return any(ranks.count(rank) == 4 for rank in ranks)
     
     # Verifica se la mano è un full (Full House)
     def full_house(self, hand):
-        values = self.extract_values(hand)
-        three_of_a_kind = self.three_of_a_kind(hand)
-        two_of_a_kind = any(values.count(value) == 2 for value in values)
-        return three_of_a_kind and two_of_a_kind
+        ranks = self.extract_ranks(hand)
+        return any(ranks.count(rank) == 3 for rank in ranks) and any(ranks.count(rank) == 2 for rank in ranks)
     
     # Verifica se la mano è un colore (Flush)
     def flush(self, hand):
-        suits = self.extract_suits(hand)
-        return len(set(suits)) == 1
+        return len({card_code(card) & 3 for card in hand}) == 1
     
     # Verifica se la mano è una scala (Straight)
     def straight(self, hand):
-        card_values = {'2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9, '10': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14}
-        indices = [card_values[value] for value in self.extract_values(hand)]
-        indices = sorted(set(indices))
+        ranks = sorted(set(self.extract_ranks(hand)))
     
-        if len(indices) < 5:
+        if len(ranks) < 5:
             return False
     
-        for i in range(len(indices) - 4):
-            if indices[i:i + 5] == list(range(indices[i], indices[i] + 5)):
+        for i in range(len(ranks) - 4):
+            if ranks[i + 4] - ranks[i] == 4:
                 return True
     
-        return indices[-5:] == [2, 3, 4, 5, 14]  # Caso speciale: l'Asso può essere basso in una scala (A, 2, 3, 4, 5)
+        return ranks[-5:] == [0, 1, 2, 3, 12]  # Caso speciale: l'Asso può essere basso in una scala (A, 2, 3, 4, 5)
 
     # Verifica se la mano è un tris (Three of a Kind)
     def three_of_a_kind(self, hand):
-        values = self.extract_values(hand)
-        return any(values.count(value) == 3 for value in values)
+        ranks = self.extract_ranks(hand)
+        return any(ranks.count(rank) == 3 for rank in ranks)
 
     # Verifica se la mano è una doppia coppia (Two Pairs)
     def two_pairs(self, hand):
-        values = self.extract_values(hand)
-        pairs = [value for value in set(values) if values.count(value) == 2]
+        ranks = self.extract_ranks(hand)
+        pairs = [rank for rank in set(ranks) if ranks.count(rank) == 2]
         return len(pairs) == 2
 
     # Verifica se la mano è una coppia (Pair)
     def pair(self, hand):
-        values = self.extract_values(hand)
-        return any(values.count(value) == 2 for value in values)
+        ranks = self.extract_ranks(hand)
+        return any(ranks.count(rank) == 2 for rank in ranks)
     
     # Verifica se la mano è una carta alta (High Card)
     def high_card(self, hand):
         return True
 
+    # Calcola la forza della mano tramite le tabelle precalcolate (categoria e kicker in un unico intero)
+    def hand_strength(self, hand):
+        return evaluate(self.encode_hand(hand))
+
     # Calcola il punteggio di una mano
     def calculate_hand_ranking(self, hand):
-        if self.royal_flush(hand):
-            return self.hand_rankings['royal_flush']
-        elif self.straight_flush(hand):
-            return self.hand_rankings['straight_flush']
-        elif self.four_of_a_kind(hand):
-            return self.hand_rankings['four_of_a_kind']
-        elif self.full_house(hand):
-            return self.hand_rankings['full_house']
-        elif self.flush(hand):
-            return self.hand_rankings['flush']
-        elif self.straight(hand):
-            return self.hand_rankings['straight']
-        elif self.three_of_a_kind(hand):
-            return self.hand_rankings['three_of_a_kind']
-        elif self.two_pairs(hand):
-            return self.hand_rankings['two_pairs']
-        elif self.pair(hand):
-            return self.hand_rankings['pair']
-        else:
-            return self.hand_rankings['high_card']
+        return hand_category(self.hand_strength(hand))
+
+    # Calcola con NumPy la forza di un intero lotto di mani: array (N, 5) o (N, 7) di carte codificate -> array (N,)
+    def rank_many(self, cards_array):
+        from python_files.batch_evaluator import rank_many
+        return rank_many(cards_array)
 
     # Determina il vincitore tra due mani di giocatori
     def determine_winner(self, player_hand, opponent_hand, community_cards, player_name="Giocatore", opponent_name="Bot1"):
-        player_best_hand = self.get_best_hand(player_hand + community_cards)
-        opponent_best_hand = self.get_best_hand(opponent_hand + community_cards)
-        player_ranking = self.calculate_hand_ranking(player_best_hand)
-        opponent_ranking = self.calculate_hand_ranking(opponent_best_hand)
+        player_strength, player_best_hand = self.evaluate_best_hand(player_hand + community_cards)
+        opponent_strength, opponent_best_hand = self.evaluate_best_hand(opponent_hand + community_cards)
+        player_ranking = hand_category(player_strength)
+        opponent_ranking = hand_category(opponent_strength)
         
-        result = self.compare_hand_rankings(player_ranking, opponent_ranking)
-        player_hand_name = self.hand_name(player_best_hand)
-        opponent_hand_name = self.hand_name(opponent_best_hand)
+        result = self.compare_hand_rankings(player_strength, opponent_strength)
+        player_hand_name = self.hand_names[player_ranking]
+        opponent_hand_name = self.hand_names[opponent_ranking]
         
         if result == "win":
             return f"{player_name} wins with {player_hand_name} worth {player_ranking} points against {opponent_name}'s {opponent_hand_name} worth {opponent_ranking} points!"
@@ -140,26 +251,38 @@ class PokerRules:
         else:
             return f"It's a tie! Both {player_name} and {opponent_name} have {player_hand_name} worth {player_ranking} points."
 
-    # Ottiene la migliore mano tra le carte fornite
-    def get_best_hand(self, cards):
-        best_hand = None
-        highest_ranking = 0
-        all_combinations = list(combinations(cards, 5))
-
-        for hand in all_combinations:
-            hand_ranking = self.calculate_hand_ranking(hand)
-            if hand_ranking > highest_ranking:
-                highest_ranking = hand_ranking
-                best_hand = hand
+    # Determina tutti i vincitori (piatto diviso in caso di parità) confrontando la forza completa delle mani
+    def determine_winners(self, players, community_cards):
+        best_strength = -1
+        winners = []
+        for player in players:
+            strength = self.hand_strength(list(player.cards) + list(community_cards))
+            if strength > best_strength:
+                best_strength = strength
+                winners = [player]
+            elif strength == best_strength:
+                winners.append(player)
+        return winners
 
-        return best_hand
+    # Calcola in un solo passaggio la forza e le cinque carte della migliore mano, memorizzate nella cache LRU
+    # in forma canonica: le mani equivalenti a meno dei semi si valutano una volta
+    @timed('best_hand', "Time to find a player's best five-card hand (PokerRules.evaluate_best_hand/get_best_hand)")
+    def evaluate_best_hand(self, cards):
+        cards_by_code = {card_code(card): card for card in cards}
+        key, suit_order = canonical_form(cards_by_code)
+        cached = self.hand_cache.get(key)
+        if cached is None:
+            strength, best_codes = evaluate_best(list(cards_by_code))
+            canonical_suit = {suit: index for index, suit in enumerate(suit_order)}
+            self.hand_cache.put(key, (strength, tuple((code & ~3) | canonical_suit[code & 3] for code in best_codes)))
+        else:
+            strength, canonical_codes = cached
+            best_codes = [(code & ~3) | suit_order[code & 3] for code in canonical_codes]
+        return strength, tuple(cards_by_code[code] for code in best_codes)
 
-    # Calcola il punteggio di una mano
-    def calculate_hand_ranking(self, hand):
-        for ranking, points in self.hand_rankings.items():
-            if getattr(self, ranking)(hand):
-                return points
-        return self.hand_rankings['high_card']
+    # Ottiene la migliore mano tra le carte fornite
+    def get_best_hand(self, cards):
+        return self.evaluate_best_hand(cards)[1]
 
     # Confronta i punteggi di due mani
     def compare_hand_rankings(self, player_ranking, opponent_ranking):
@@ -172,50 +295,8 @@ class PokerRules:
 
     # Ottiene il nome della combinazione di una mano
     def hand_name(self, hand):
-        for ranking in self.hand_rankings.keys():
-            if getattr(self, ranking)(hand):
-                return ranking.replace('_', ' ').title()
-        return "High Card"
+        return self.hand_names[self.calculate_hand_ranking(hand)]
     
     # Fornisce una spiegazione della combinazione di una mano
     def get_hand_explanation(self, hand):
-        if self.royal_flush(hand):
-            return ("Hand: Royal Flush\n"
-                    "The highest straight flush, consisting of the ace, king, queen, jack and ten all of the same suit.\n"
-                    "Worth 10 points.")
-        elif self.straight_flush(hand):
-            return ("Hand: Straight Flush\n"
-                    "Five consecutive cards of the same suit.\n"
-                    "Worth 9 points.")
-        elif self.four_of_a_kind(hand):
-            return ("Hand: Four of a Kind\n"
-                    "Four cards of the same rank.\n"
-                    "Worth 8 points.")
-        elif self.full_house(hand):
-            return ("Hand: Full House\n"
-                    "Three of a kind combined with a pair.\n"
-                    "Worth 7 points.")
-        elif self.flush(hand):
-            return ("Hand: Flush\n"
-                    "Five cards of the same suit, not in sequence.\n"
-                    "Worth 6 points.")
-        elif self.straight(hand):
-            return ("Hand: Straight\n"
-                    "Five consecutive cards of different suits.\n"
-                    "Worth 5 points.")
-        elif self.three_of_a_kind(hand):
-            return ("Hand: Three of a Kind\n"
-                    "Three cards of the same rank.\n"
-                    "Worth 4 points.")
-        elif self.two_pairs(hand):
-            return ("Hand: Two Pairs\n"
-                    "Two different pairs.\n"
-                    "Worth 3 points.")
-        elif self.pair(hand):
-            return ("Hand: Pair\n"
-                    "Two cards of the same rank.\n"
-                    "Worth 2 points.")
-        else:
-            return ("Hand: High Card\n"
-                    "None of the above combinations.\n"
-                    "Worth 1 point.")
\ No newline at end of file
+        return HAND_EXPLANATIONS[self.calculate_hand_ranking(hand)]
\ No newline at end of file
@@ -0,0 +1,106 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from python_files.deck import card_code
+from python_files.equity import MAX_OPPONENTS
+
+# Tabella precalcolata dell'equity pre-flop delle 169 mani iniziali canoniche
+# (coppie, suited e offsuit) contro 1-9 avversari con carte casuali.
+# Si genera offline con:  python -m python_files.preflop_table --iterations 100000
+# e viene caricata una sola volta per processo, alla prima richiesta.
+# Con 100.000 distribuzioni per casella l'errore standard è al più 0,0016; le distribuzioni sono le stesse
+# per tutte le mani (numeri casuali comuni), così l'ordine tra mani vicine (AKs, AQs, AJs) non dipende dal rumore.
+
+DEFAULT_ITERATIONS = 100_000
+
+RANK_CHARS = '23456789TJQKA'
+TABLE_FILE = 'preflop_equity.json'
+DEFAULT_TABLE_PATH = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', TABLE_FILE))
+
+_table = None
+
+# Chiave canonica di due carte personali: 'AA', 'AKs', 'AKo', ...
+def canonical_hand(hole_cards):
+    first, second = sorted((card_code(card) for card in hole_cards), reverse=True)
+    high, low = RANK_CHARS[first >> 2], RANK_CHARS[second >> 2]
+    if high == low:
+        return high + low
+    return high + low + ('s' if (first & 3) == (second & 3) else 'o')
+
+# Tutte le 169 chiavi canoniche, dalla più alta
+def canonical_hands():
+    hands = []
+    for high in range(12, -1, -1):
+        for low in range(high, -1, -1):
+            if high == low:
+                hands.append(RANK_CHARS[high] * 2)
+            else:
+                hands.append(RANK_CHARS[high] + RANK_CHARS[low] + 's')
+                hands.append(RANK_CHARS[high] + RANK_CHARS[low] + 'o')
+    return hands
+
+# Due codifiche di carte che rappresentano la mano canonica
+def representative_cards(hand):
+    high, low = RANK_CHARS.index(hand[0]), RANK_CHARS.index(hand[1])
+    second_suit = 0 if hand.endswith('s') else 1
+    return [high << 2, (low << 2) | second_suit]
+
+# Vittorie + metà dei pareggi di una mano canonica contro 1-9 avversari, su iterations distribuzioni in blocco
+# (batch_deal). Il generatore dipende solo dal seed e dal numero di avversari, non dalla mano.
+def simulate_hand(hand, iterations, seed=0):
+    from python_files.batch_deal import deal_many, rank_deals, rank_hole_cards
+    from python_files.rng import numpy_generator
+
+    hole_codes = representative_cards(hand)
+    shares = []
+    for num_opponents in range(1, MAX_OPPONENTS + 1):
+        deals = deal_many(iterations, num_opponents, dead_cards=hole_codes,
+                          generator=numpy_generator([seed, num_opponents]))
+        hero = rank_hole_cards(deals, hole_codes, num_opponents)
+        best_opponent = rank_deals(deals, num_opponents).max(axis=1)
+        shares.append(round(float((hero > best_opponent).mean() + (hero == best_opponent).mean() / 2), 4))
+    return shares
+
+# Simula ogni mano canonica contro 1-9 avversari, eventualmente su più processi
+def build_table(iterations=DEFAULT_ITERATIONS, seed=0, workers=1):
+    hands = canonical_hands()
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            shares = list(pool.map(simulate_hand, hands, [iterations] * len(hands), [seed] * len(hands)))
+    else:
+        shares = [simulate_hand(hand, iterations, seed) for hand in hands]
+    return {'iterations': iterations, 'seed': seed, 'hands': dict(zip(hands, shares))}
+
+# Carica la tabella dal file (una sola volta per processo)
+def load_table(path=DEFAULT_TABLE_PATH):
+    global _table
+    if _table is None:
+        with open(path, 'r') as file:
+            _table = json.load(file)['hands']
+    return _table
+
+# Equity pre-flop delle carte personali contro num_opponents avversari, con una sola ricerca in tabella
+def preflop_equity(hole_cards, num_opponents):
+    num_opponents = min(max(num_opponents, 1), MAX_OPPONENTS)
+    return load_table()[canonical_hand(hole_cards)][num_opponents - 1]
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the pre-flop equity table for the 169 starting hands")
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS,
+                        help="rollouts per hand and opponent count")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--output', default=DEFAULT_TABLE_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    table = build_table(args.iterations, args.seed, args.workers)
+    with open(args.output, 'w') as file:
+        json.dump(table, file, separators=(',', ':'))
+    print(f"Pre-flop table written to {args.output} in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import random
+
+# Generatori di numeri casuali iniettabili in Game, Deck e Bot.
+# Senza seed si usa il generatore globale del modulo random, come sempre (random.seed riproduce la partita);
+# con il seed di un tavolo la partita ha un proprio flusso, da cui derivano flussi indipendenti
+# per il mazzo e per ogni bot: le mani si possono rigiocare e tavoli o processi diversi non si influenzano.
+
+# Generatore per un seed (None = generatore globale)
+def make_rng(seed=None):
+    return random if seed is None else random.Random(seed)
+
+# Nuovo flusso indipendente derivato da rng (il generatore globale resta condiviso)
+def spawn(rng):
+    if rng is random:
+        return random
+    return random.Random(rng.getrandbits(64))
+
+# Backend vettoriale per le simulazioni in blocco. NumPy si carica solo quando serve.
+def numpy_generator(seed=None):
+    import numpy as np
+    return np.random.default_rng(seed)
+
+# count permutazioni indipendenti degli indici 0..size-1 (una per riga), mescolate tutte insieme con NumPy
+def shuffled_indices(count, size=52, generator=None):
+    import numpy as np
+    generator = generator if generator is not None else numpy_generator()
+    decks = np.tile(np.arange(size, dtype=np.int8), (count, 1))
+    return generator.permuted(decks, axis=1, out=decks)
+
+# Le prime k posizioni di count permutazioni indipendenti di 0..size-1: Fisher-Yates parziale vettoriale,
+# molto più rapido di shuffled_indices quando servono poche carte del mazzo
+def sampled_indices(count, size, k, generator=None):
+    import numpy as np
+    generator = generator if generator is not None else numpy_generator()
+    decks = np.tile(np.arange(size, dtype=np.int8), (count, 1))
+    rows = np.arange(count)
+    for i in range(k):
+        swap = i + (generator.random(count) * (size - i)).astype(np.intp)
+        picked = decks[rows, swap]
+        decks[rows, swap] = decks[:, i]
+        decks[:, i] = picked
+    return decks[:, :k]
@@ -0,0 +1,128 @@
+import argparse
+import random
+import time
+
+from python_files.game import Game
+from python_files.logging_config import configure_logging
+from python_files.players import BotType
+from python_files.rng import make_rng, spawn
+
+# Simulatore headless: gioca mani complete bot contro bot, senza Flask né HTTP,
+# per mettere a punto le strategie dei BotType offline.
+
+VOLUNTARY_ACTIONS = ('call', 'bet', 'raise')
+DEFAULT_EQUITY_ITERATIONS = 100
+
+# Gioca una mano completa e restituisce, per ogni posto, tipo di bot, quota di vincita, variazione di fiches e VPIP
+def play_hand(game):
+    game.setup_players()
+    seats = list(game.players)
+    starting_chips = {id(player): player.chips + player.current_bet for player in seats}
+    voluntary = set()
+
+    while game.phase != Game.SHOWDOWN:
+        player = game.turn_manager.get_current_player()
+        action, bet_amount = player.make_decision(game.bot_game_state(), game.phase)
+        if game.phase == Game.PRE_FLOP and action in VOLUNTARY_ACTIONS:
+            voluntary.add(id(player))
+        game.execute_turn(player, action, bet_amount)
+
+    winners = game.award_pot()
+    share = 1 / len(winners)
+    return [
+        {
+            'bot_type': player.bot_type.name,
+            'won': share if player in winners else 0.0,
+            'chip_delta': player.chips - starting_chips[id(player)],
+            'vpip': id(player) in voluntary
+        }
+        for player in seats
+    ]
+
+# Somma i risultati delle mani per BotType: mani giocate, vittorie, fiches, VPIP
+def aggregate(hand_results, totals=None):
+    totals = totals if totals is not None else {}
+    for seat in hand_results:
+        stats = totals.setdefault(seat['bot_type'], {'hands': 0, 'wins': 0.0, 'chip_delta': 0, 'vpip_hands': 0})
+        stats['hands'] += 1
+        stats['wins'] += seat['won']
+        stats['chip_delta'] += seat['chip_delta']
+        stats['vpip_hands'] += seat['vpip']
+    return totals
+
+# Aggiunge win rate e VPIP in percentuale ai totali
+def summarize(totals):
+    return {
+        bot_type: dict(stats, win_rate=stats['wins'] / stats['hands'], vpip=stats['vpip_hands'] / stats['hands'])
+        for bot_type, stats in totals.items()
+    }
+
+# Crea un tavolo headless; i bot stimano l'equity con un numero fisso di simulazioni
+# e senza limite di tempo, così che lo stesso seed riproduca le stesse mani
+def create_game(bot_types, equity_iterations, rng=None):
+    game = Game(headless=True, bot_types=bot_types, rng=rng)
+    for bot in game.players:
+        bot.equity_iterations = equity_iterations
+        bot.equity_time_budget = None
+    return game
+
+# Gioca una mano per ogni flusso casuale di rngs allo stesso tavolo e restituisce i risultati di ogni mano.
+# Il tavolo si crea una volta sola e Game.new_hand lo prepara per ogni mano: l'esito di una mano dipende
+# solo dal suo flusso casuale, non da quante mani il tavolo ha già giocato.
+def play_hands(bot_types, rngs, equity_iterations=DEFAULT_EQUITY_ITERATIONS):
+    game = create_game(bot_types, equity_iterations, random.Random(0))
+    results = []
+    for rng in rngs:
+        game.new_hand(rng)
+        results.append(play_hand(game))
+    return results
+
+# Come play_hands, con un seed per mano (i seed sono numeri: si possono passare a un altro processo)
+def play_seeded_hands(bot_types, hand_seeds, equity_iterations=DEFAULT_EQUITY_ITERATIONS):
+    return play_hands(bot_types, (random.Random(hand_seed) for hand_seed in hand_seeds), equity_iterations)
+
+# Gioca n_hands mani allo stesso tavolo a partire dal seed e restituisce i risultati di ogni mano;
+# ogni mano ha il proprio flusso casuale derivato da quello del tavolo
+def run_hands(bot_types, n_hands, seed=None, equity_iterations=DEFAULT_EQUITY_ITERATIONS):
+    rng = make_rng(seed)
+    return play_hands(bot_types, (spawn(rng) for _ in range(n_hands)), equity_iterations)
+
+# Gioca n_hands mani con i bot indicati (un posto per ogni BotType in bot_mix)
+# e riporta le statistiche per tipo e le mani al secondo.
+# equity_iterations = 0 disattiva le stime Monte Carlo dei bot al turn e al river.
+def simulate(n_hands, bot_mix, seed=None, equity_iterations=DEFAULT_EQUITY_ITERATIONS):
+    bot_types = [BotType[bot_type] if isinstance(bot_type, str) else bot_type for bot_type in bot_mix]
+    if not 2 <= len(bot_types) <= 10:
+        raise ValueError(f"A table needs between 2 and 10 bots, got {len(bot_types)}")
+
+    totals = {}
+    start = time.perf_counter()
+    for hand_results in run_hands(bot_types, n_hands, seed, equity_iterations):
+        aggregate(hand_results, totals)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'hands': n_hands,
+        'seconds': elapsed,
+        'hands_per_second': n_hands / elapsed if elapsed > 0 else 0.0,
+        'bot_types': summarize(totals)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Play headless bot-vs-bot hands and report hands/second")
+    parser.add_argument('--hands', type=int, default=1000)
+    parser.add_argument('--bots', nargs='+', default=[bot_type.name for bot_type in BotType],
+                        help="one BotType name per seat")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--equity-iterations', type=int, default=DEFAULT_EQUITY_ITERATIONS,
+                        help="Monte Carlo rollouts per bot decision on the turn and river (0 disables them)")
+    args = parser.parse_args()
+
+    configure_logging()
+    result = simulate(args.hands, args.bots, args.seed, args.equity_iterations)
+    print(f"{result['hands']} hands in {result['seconds']:.2f}s ({result['hands_per_second']:.0f} hands/s)")
+    for bot_type, stats in sorted(result['bot_types'].items()):
+        print(f"{bot_type:16} win rate {stats['win_rate']:.3f}  chips {stats['chip_delta']:+d}  VPIP {stats['vpip']:.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+# Registro dei tavoli ospitati da un solo processo del server: ogni partita ha un ID,
+# un proprio lock (le richieste sullo stesso tavolo vengono servite una alla volta,
+# quelle su tavoli diversi in parallelo), e i tavoli inattivi vengono eliminati.
+
+DEFAULT_MAX_TABLES = 500
+DEFAULT_IDLE_TIMEOUT = 30 * 60  # Secondi di inattività dopo i quali un tavolo viene eliminato
+OUTBOX_SIZE = 100  # Eventi del tavolo conservati in attesa di essere recapitati al client
+LISTENER_BACKLOG = 1000  # Eventi in coda per ogni client connesso in streaming
+
+class TableNotFoundError(KeyError):
+    pass
+
+class TableLimitError(RuntimeError):
+    pass
+
+class Table:
+    __slots__ = ('table_id', 'game', 'lock', 'last_used', 'outbox', 'listeners', 'listeners_lock', 'sequence')
+
+    def __init__(self, table_id, game):
+        self.table_id = table_id
+        self.game = game
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+        self.outbox = deque(maxlen=OUTBOX_SIZE)
+        self.listeners = ()
+        self.listeners_lock = threading.Lock()
+        self.sequence = 0
+
+    # Da iscrivere agli eventi della partita: numera l'evento, lo mette nella coda del tavolo
+    # e lo inoltra ai client connessi (chi non riesce a stare al passo perde gli eventi in eccesso)
+    def publish(self, event):
+        self.sequence += 1
+        event = dict(event, id=self.sequence)
+        self.outbox.append(event)
+        for listener in self.listeners:
+            try:
+                listener.put_nowait(event)
+            except queue.Full:
+                pass
+
+    # Coda degli eventi per un client connesso in streaming (o un oggetto qualsiasi con put_nowait)
+    def listen(self, listener=None):
+        if listener is None:
+            listener = queue.Queue(maxsize=LISTENER_BACKLOG)
+        with self.listeners_lock:
+            self.listeners = self.listeners + (listener,)
+        return listener
+
+    def unlisten(self, listener):
+        with self.listeners_lock:
+            self.listeners = tuple(other for other in self.listeners if other is not listener)
+
+    # Eventi in attesa, in ordine di pubblicazione; la coda viene svuotata
+    def drain(self):
+        events = list(self.outbox)
+        self.outbox.clear()
+        return events
+
+class TableRegistry:
+    def __init__(self, max_tables=DEFAULT_MAX_TABLES, idle_timeout=DEFAULT_IDLE_TIMEOUT, clock=time.monotonic):
+        self.max_tables = max_tables
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+        self.tables = OrderedDict()  # Dal tavolo usato meno di recente
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.tables)
+
+    def __contains__(self, table_id):
+        return table_id in self.tables
+
+    # Elimina i tavoli inattivi da più di idle_timeout secondi (da chiamare con self.lock acquisito)
+    def evict_idle(self):
+        deadline = self.clock() - self.idle_timeout
+        evicted = []
+        for table_id, table in list(self.tables.items()):
+            if table.last_used > deadline:
+                break
+            if table.lock.locked() or table.listeners:
+                continue
+            del self.tables[table_id]
+            evicted.append(table_id)
+        return evicted
+
+    # Aggiunge un tavolo (da chiamare con self.lock acquisito)
+    def add(self, game):
+        self.evict_idle()
+        if len(self.tables) >= self.max_tables:
+            raise TableLimitError(f"Too many live tables (max {self.max_tables})")
+        table = Table(uuid.uuid4().hex, game)
+        table.last_used = self.clock()
+        self.tables[table.table_id] = table
+        return table.table_id
+
+    # Registra una nuova partita e restituisce l'ID del tavolo.
+    # prepare(tavolo), se indicato, prepara la partita con il lock del tavolo acquisito prima che il tavolo
+    # sia visibile: le altre richieste per lo stesso tavolo attendono che la partita sia pronta.
+    # Se prepare fallisce il tavolo viene eliminato.
+    def create(self, game, prepare=None):
+        with self.lock:
+            table_id = self.add(game)
+            table = self.tables[table_id]
+            table.lock.acquire()
+        try:
+            if prepare is not None:
+                prepare(table)
+        except BaseException:
+            self.remove(table_id)
+            raise
+        finally:
+            table.lock.release()
+        return table_id
+
+    # Sostituisce la partita di un tavolo esistente (stesso ID) o ne crea uno nuovo.
+    # on_replace(partita precedente) e prepare(tavolo), se indicati, vengono chiamati con il lock del tavolo
+    # acquisito, prima che la nuova partita prenda il posto della precedente (che resta se prepare fallisce).
+    def replace(self, table_id, game, on_replace=None, prepare=None):
+        with self.lock:
+            table = self.tables.get(table_id) if table_id else None
+            if table is not None:
+                self.touch(table)
+        if table is None:
+            return self.create(game, prepare)
+        with table.lock:
+            if on_replace is not None:
+                on_replace(table.game)
+            table.outbox.clear()
+            if prepare is not None:
+                prepare(table)
+            table.game = game
+        return table_id
+
+    def remove(self, table_id):
+        with self.lock:
+            return self.tables.pop(table_id, None) is not None
+
+    # Aggiorna l'ultimo utilizzo di un tavolo (da chiamare con self.lock acquisito)
+    def touch(self, table):
+        table.last_used = self.clock()
+        self.tables.move_to_end(table.table_id)
+
+    def get(self, table_id):
+        with self.lock:
+            self.evict_idle()
+            table = self.tables.get(table_id)
+            if table is None:
+                raise TableNotFoundError(table_id)
+            self.touch(table)
+            return table
+
+    # Valori istantanei per le metriche: nome -> (descrizione, valore)
+    def gauges(self):
+        with self.lock:
+            tables = list(self.tables.values())
+        return {
+            'live_tables': ("Tables hosted by this process", len(tables)),
+            'event_listeners': ("Clients connected to table event streams",
+                                sum(len(table.listeners) for table in tables))
+        }
+
+    # Restituisce la partita del tavolo tenendone il lock per tutta la durata del blocco with
+    @contextmanager
+    def checkout(self, table_id):
+        table = self.get(table_id)
+        with table.lock:
+            yield table.game
+        with self.lock:
+            if table_id in self.tables:
+                self.touch(table)
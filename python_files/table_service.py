@@ -0,0 +1,94 @@
+import os
+import random
+
+from python_files.game import Game
+from python_files.hand_evaluator import seven_table_gauges
+from python_files.poker_rules import PokerRules
+from python_files.table_registry import TableRegistry, DEFAULT_MAX_TABLES, DEFAULT_IDLE_TIMEOUT
+
+# Logica dei tavoli comune ai due server (Flask in texas_hold_em_poker.py, ASGI in texas_hold_em_poker_asgi.py):
+# registro dei tavoli, creazione delle partite, mosse e scelta tra stato completo e differenze.
+# I server si limitano a leggere i parametri della richiesta e a scrivere la risposta.
+
+HEARTBEAT_INTERVAL = 15  # Secondi tra due messaggi keep-alive sullo stream degli eventi
+
+# Registro dei tavoli configurato con le variabili d'ambiente POKER_MAX_TABLES e POKER_TABLE_IDLE_TIMEOUT
+def create_registry():
+    return TableRegistry(
+        max_tables=int(os.environ.get('POKER_MAX_TABLES', DEFAULT_MAX_TABLES)),
+        idle_timeout=float(os.environ.get('POKER_TABLE_IDLE_TIMEOUT', DEFAULT_IDLE_TIMEOUT))
+    )
+
+# Parametro della richiesta non valido: i server rispondono 400
+class BadRequestError(ValueError):
+    pass
+
+# Intero opzionale letto dal parametro name della richiesta (None se assente)
+def parse_optional_int(value, name):
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise BadRequestError(f"Invalid {name}: {value!r}") from None
+
+# Crea una nuova partita e ne restituisce ID del tavolo e stato. Con table_id la partita sostituisce quella
+# di quel tavolo (il client ricomincia al proprio tavolo); senza, si apre sempre un tavolo nuovo, così
+# client diversi (anche più schede dello stesso browser) non si sovrascrivono mai la partita.
+# Sullo stesso tavolo le versioni dello stato proseguono da quelle della partita precedente.
+# Gli eventi pubblicati dalla partita finiscono nella coda del tavolo e vengono recapitati al client.
+# Con play_bots i bot che precedono il giocatore umano giocano subito; con seed la mano si può rigiocare,
+# altrimenti ogni tavolo ha comunque un proprio flusso casuale, indipendente da quello degli altri tavoli.
+# La partita viene preparata con il lock del tavolo acquisito, prima che altre richieste possano vederla.
+def create_table_game(registry, table_id=None, play_bots=False, seed=None):
+    game = Game(seed=seed) if seed is not None else Game(rng=random.Random())
+    state = {}
+
+    def prepare(table):
+        game.events.subscribe(table.publish)
+        game.setup_players()
+        if play_bots:
+            game.play_bot_turns()
+        state.update(game.generate_game_state_response())
+
+    if table_id:
+        table_id = registry.replace(table_id, game, game.continue_versions, prepare)
+    else:
+        table_id = registry.create(game, prepare)
+    state['table_id'] = table_id
+    return table_id, state
+
+# Stato della partita: completo, oppure solo le differenze rispetto alla versione since
+def game_state(game, since=None):
+    if since is None:
+        return game.generate_game_state_response()
+    return game.generate_state_delta(since)
+
+# Mossa del giocatore di turno, seguita da quelle dei bot; la risposta porta gli eventi non ancora recapitati
+def play_action(registry, table_id, action, bet_amount, since=None):
+    with registry.checkout(table_id) as game:
+        current_player = game.turn_manager.get_current_player()
+        message = game.execute_turn(current_player, action, bet_amount)
+        game.play_bot_turns()  # I bot rispondono subito, i client ricevono le loro mosse come eventi
+        response = game_state(game, since)
+        response['message'] = message
+        response['events'] = registry.get(table_id).drain()
+        return response
+
+# Passa il turno al giocatore successivo (e alla fase successiva, se quella corrente è finita)
+def advance_turn(registry, table_id, since=None):
+    with registry.checkout(table_id) as game:
+        game.turn_manager.next_turn()
+        if game.check_phase_end():
+            game.next_phase()
+        response = game_state(game, since)
+        response['events'] = registry.get(table_id).drain()
+        return response
+
+def read_state(registry, table_id, since=None):
+    with registry.checkout(table_id) as game:
+        return game_state(game, since)
+
+# Valori istantanei per la route /metrics
+def gauges(registry):
+    return {**registry.gauges(), **PokerRules.hand_cache.gauges(), **seven_table_gauges()}
@@ -0,0 +1,87 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import combinations_with_replacement
+
+from python_files.equity import derive_seeds
+from python_files.logging_config import configure_logging
+from python_files.players import BotType
+from python_files.simulation import DEFAULT_EQUITY_ITERATIONS, aggregate, play_seeded_hands, summarize
+
+# Campionato bot contro bot: ogni coppia di BotType si affronta su tavoli da 2 a 10 posti.
+# Le mani di ogni tavolo vengono giocate in parallelo su un pool di processi, a blocchi di chunk_size mani,
+# ognuna con il proprio seed derivato da quello del tavolo (a sua volta derivato dal seed principale).
+# I risultati arrivano mano per mano appena un blocco termina e i totali vengono sommati sempre nell'ordine
+# dei seed, così che lo stesso seed dia lo stesso risultato qualunque sia il numero di processi o di blocchi.
+
+TABLE_SIZES = range(2, 11)
+DEFAULT_HANDS_PER_TABLE = 20
+DEFAULT_CHUNK_SIZE = 5  # Mani per richiesta al pool: blocchi più piccoli, risultati più frequenti
+
+# Tavoli del campionato: per ogni coppia di BotType e dimensione, posti alternati tra i due tipi
+def league_tables(table_sizes=TABLE_SIZES):
+    tables = []
+    for first, second in combinations_with_replacement(BotType, 2):
+        for size in table_sizes:
+            tables.append([(first if seat % 2 == 0 else second).name for seat in range(size)])
+    return tables
+
+# Eseguita in un processo del pool: riceve e restituisce solo nomi e numeri
+def run_chunk(bot_types, hand_seeds, equity_iterations):
+    return play_seeded_hands([BotType[bot_type] for bot_type in bot_types], hand_seeds, equity_iterations)
+
+# Gioca il campionato. on_hand(tavolo, risultati_mano) viene chiamato una volta per mano, man mano che
+# i blocchi terminano (in ordine di completamento, non di seed)
+def run_league(table_sizes=TABLE_SIZES, hands_per_table=DEFAULT_HANDS_PER_TABLE, seed=None, workers=None,
+               equity_iterations=DEFAULT_EQUITY_ITERATIONS, on_hand=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    tables = league_tables(table_sizes)
+    hand_seeds = [derive_seeds(table_seed, hands_per_table) for table_seed in derive_seeds(seed, len(tables))]
+    results = [[None] * hands_per_table for _ in tables]
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = {
+            pool.submit(run_chunk, table, table_seeds[first:first + chunk_size], equity_iterations): (index, first)
+            for index, (table, table_seeds) in enumerate(zip(tables, hand_seeds))
+            for first in range(0, hands_per_table, chunk_size)
+        }
+        for future in as_completed(futures):
+            index, first = futures[future]
+            for offset, hand_results in enumerate(future.result()):
+                results[index][first + offset] = hand_results
+                if on_hand is not None:
+                    on_hand(tables[index], hand_results)
+    elapsed = time.perf_counter() - start
+
+    totals = {}
+    for table_results in results:
+        for hand_results in table_results:
+            aggregate(hand_results, totals)
+    hands = len(tables) * hands_per_table
+    return {
+        'tables': len(tables),
+        'hands': hands,
+        'seconds': elapsed,
+        'hands_per_second': hands / elapsed if elapsed > 0 else 0.0,
+        'bot_types': summarize(totals)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a parallel bot-vs-bot league over every BotType pairing")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(TABLE_SIZES), help="table sizes (2-10)")
+    parser.add_argument('--hands-per-table', type=int, default=DEFAULT_HANDS_PER_TABLE)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--equity-iterations', type=int, default=DEFAULT_EQUITY_ITERATIONS)
+    args = parser.parse_args()
+
+    configure_logging()
+    result = run_league(args.sizes, args.hands_per_table, args.seed, args.workers, args.equity_iterations)
+    print(f"{result['tables']} tables, {result['hands']} hands in {result['seconds']:.2f}s "
+          f"({result['hands_per_second']:.0f} hands/s)")
+    for bot_type, stats in sorted(result['bot_types'].items()):
+        print(f"{bot_type:16} win rate {stats['win_rate']:.3f}  chips {stats['chip_delta']:+d}  VPIP {stats['vpip']:.3f}")
+
+if __name__ == "__main__":
+    main()
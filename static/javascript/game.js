@@ -101,28 +101,16 @@ function executeAction(action, betAmount = 0) {
     fetch('/action', {
         method: 'POST',
         headers: { 'Content-Type': 'application/x-www-form-urlencoded' },
-        body: new URLSearchParams({
+        body: tableParams({
             'action': action,
             'betAmount': betAmount
         })
     })
     .then(response => response.json())
     .then(data => {
+        // Le mosse dei bot che seguono arrivano come eventi dal server (vedi subscribeToTable)
         console.log("Azione eseguita:", data);
-        displayHand(data.player_hand, 'player-hand');
-        displayHand(data.community_cards, 'community-cards');
-        displayDeck(data.deck_card, 'deck');
-        updateButtons('betting', data.current_turn, data.blinds_info);
-        showTurnMessage(data.message);
-
-        if (data.winning_hand) {
-            illuminateWinningHand(data.winning_hand);
-            showWinningExplanation(data.winning_hand);
-        }
-
-        if (data.phase !== "showdown") {
-            advanceTurn();
-        }
+        renderGameState(data);
     })
     .catch(error => {
         console.error('Errore:', error);
@@ -248,6 +236,76 @@ function updateGameState(gameState) {
     highlightCurrentPlayerTurn(gameState.current_turn);
 }
 
+// Stream degli eventi del tavolo (Server-Sent Events): azioni, carte, piatto, fasi e turni
+// arrivano dal server appena accadono, senza richieste di polling
+let tableEvents = null;
+let currentBlindsInfo = {};
+let currentPhase = null;  // Fase corrente della mano, dagli eventi 'phase' e dalle risposte del server
+
+// ID del tavolo di questa scheda, restituito da /new-game: ogni richiesta lo porta con sé,
+// così più schede (o più client) giocano ciascuna al proprio tavolo
+let tableId = null;
+
+// Parametri di una richiesta al server, con l'ID del tavolo se ne abbiamo già uno
+function tableParams(params = {}) {
+    return new URLSearchParams(tableId ? { ...params, 'table_id': tableId } : params);
+}
+
+// Mostra lo stato completo del tavolo (risposta di /action ed eventi 'state')
+function renderGameState(data) {
+    displayHand(data.player_hand, 'player-hand');
+    displayHand(data.community_cards, 'community-cards');
+    displayDeck(data.deck_card, 'deck');
+    currentPhase = data.phase;
+    currentBlindsInfo = data.blinds_info;
+    updateButtons(data.phase === "showdown" ? 'endGame' : 'betting', data.current_turn, data.blinds_info);
+    updateGameState(data);
+
+    if (data.winning_hand) {
+        illuminateWinningHand(data.winning_hand);
+        showWinningExplanation(data.winning_hand);
+    }
+}
+
+function subscribeToTable() {
+    if (tableEvents) {
+        tableEvents.close();
+    }
+    tableEvents = new EventSource('/events?' + tableParams());
+
+    tableEvents.addEventListener('action', event => {
+        const data = JSON.parse(event.data);
+        showTurnMessage(`${data.message || `${data.player}: ${data.action}`} (piatto: ${data.pot})`);
+    });
+
+    tableEvents.addEventListener('phase', event => {
+        const data = JSON.parse(event.data);
+        currentPhase = data.phase;
+        displayHand(data.community_cards, 'community-cards');
+    });
+
+    tableEvents.addEventListener('deal', event => {
+        const data = JSON.parse(event.data);
+        currentBlindsInfo = data.blinds_info;
+        showTurnMessage(`Carte distribuite (piatto: ${data.pot})`);
+    });
+
+    // Stato completo dopo ogni fase giocata: carte, fiches, piatto e turno
+    tableEvents.addEventListener('state', event => {
+        renderGameState(JSON.parse(event.data));
+    });
+
+    tableEvents.addEventListener('turn', event => {
+        const data = JSON.parse(event.data);
+        updateButtons(currentPhase === "showdown" ? 'endGame' : 'betting', data.current_turn, currentBlindsInfo);
+        updateGameState(data);
+    });
+
+    tableEvents.onerror = () => {
+        console.warn('Connessione agli eventi del tavolo interrotta, nuovo tentativo in corso...');
+    };
+}
+
 function logMessage(type, message) {
     const logPrefix = `[${new Date().toISOString()}] ${type.toUpperCase()}:`;
     console.log(`${logPrefix} ${message}`);
@@ -261,18 +319,22 @@ function newGame() {
     fetch('/new-game', {
         method: 'POST',
         headers: { 'Content-Type': 'application/x-www-form-urlencoded' },
-        body: new URLSearchParams()
+        body: tableParams()
     })
     .then(response => response.json())
     .then(data => {
         console.log("Dati ricevuti da /new-game:", data);
+        tableId = data.table_id;
         document.getElementById('player-hand').innerHTML = '';
         document.getElementById('community-cards').innerHTML = '';
         document.getElementById('deck').innerHTML = '';
         document.getElementById('winner').textContent = '';
         document.getElementById('winner').style.display = 'none';
         document.getElementById('blinds-info').innerHTML = '';
+        currentBlindsInfo = data.blinds_info;
+        currentPhase = data.phase;
         updateButtons('readyToStart', data.current_turn, data.blinds_info);
+        subscribeToTable();
     })
     .catch(error => {
         console.error('Errore nel reimpostare il gioco:', error);
@@ -285,11 +347,18 @@ function startGame() {
     fetch('/start-game', {
         method: 'POST',
         headers: { 'Content-Type': 'application/x-www-form-urlencoded' },
-        body: new URLSearchParams()
+        body: tableParams()
     })
     .then(response => response.json())
     .then(data => {
         console.log("Dati ricevuti da /start-game:", data);
+        tableId = data.table_id;
+        currentBlindsInfo = data.blinds_info;
+        currentPhase = data.phase;
+        displayHand(data.player_hand, 'player-hand');
+        displayHand(data.community_cards, 'community-cards');
+        displayDeck(data.deck_card, 'deck');
+        updateButtons('betting', data.current_turn, data.blinds_info);
         updateGameState(data);
     })
     .catch(error => {
@@ -303,58 +372,6 @@ function exitGame() {
     window.location.href = '/';
 }
 
-function advanceTurn() {
-    console.log('Avanzamento del turno...');
-    fetch('/advance-turn', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' }
-    })
-    .then(response => response.json())
-    .then(data => {
-        console.log("Dati ricevuti da /advance-turn:", data);
-        updateGameState(data);
-
-        if (data.current_turn.startsWith("Bot")) {
-            executeBotTurn(10);
-        } else {
-            updateButtons('betting', data.current_turn, data.blinds_info);
-        }
-    })
-    .catch(error => {
-        console.error('Errore durante l\'avanzamento del turno:', error);
-        alert('Si è verificato un errore durante l\'avanzamento del turno.');
-    });
-}
-
-function executeBotTurn(maxActions = 10) {
-    if (maxActions <= 0) {
-        console.error('Limite massimo di azioni bot raggiunto. Terminazione del ciclo.');
-        alert('Il limite massimo di azioni bot è stato raggiunto. Verifica il funzionamento del gioco.');
-        return;
-    }
-
-    fetch('/execute-bot-turn', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' }
-    })
-    .then(response => response.json())
-    .then(data => {
-        console.log("Bot ha eseguito il turno:", data);
-        updateGameState(data);
-
-        if (data.current_turn.startsWith("Bot")) {
-            executeBotTurn(maxActions - 1);
-        } else {
-            updateButtons('betting', data.current_turn, data.blinds_info);
-        }
-    })
-    .catch(error => {
-        console.error('Errore durante il turno del bot:', error);
-        alert('Si è verificato un errore durante il turno del bot. Per favore, riprova.');
-    });
-}
-
-
 // Funzione per illuminare la mano vincente
 function illuminateWinningHand(winningHand) {
     winningHand.forEach(card => {
@@ -0,0 +1,20 @@
+import pytest
+
+# I test marcati benchmark (tests/test_benchmarks.py) sono lenti e misurano i tempi invece di verificare
+# il comportamento: una normale esecuzione di pytest li salta. Si eseguono con --run-benchmarks,
+# come fa python -m python_files.benchmark.
+
+def pytest_addoption(parser):
+    parser.addoption('--run-benchmarks', action='store_true', default=False,
+                     help="run the tests marked as benchmark (skipped by default)")
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', "benchmark: performance benchmark, run only with --run-benchmarks")
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('--run-benchmarks'):
+        return
+    skip = pytest.mark.skip(reason="benchmark: run with --run-benchmarks or python -m python_files.benchmark")
+    for item in items:
+        if item.get_closest_marker('benchmark') is not None:
+            item.add_marker(skip)
@@ -0,0 +1,138 @@
+import sys
+import os
+import json
+import asyncio
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from texas_hold_em_poker_asgi import app, registry
+
+# Esegue una richiesta direttamente sull'applicazione ASGI e restituisce (status, header, corpo JSON)
+async def call(method, path, payload=None, query=b''):
+    body = json.dumps(payload).encode() if payload is not None else b''
+    scope = {'type': 'http', 'method': method, 'path': path, 'query_string': query,
+             'headers': [(b'content-type', b'application/json')]}
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    headers = dict(sent[0]['headers'])
+    return sent[0]['status'], headers, json.loads(sent[1]['body'])
+
+def test_new_game_creates_a_table_per_client():
+    status, headers, state = asyncio.run(call('POST', '/new-game'))
+    assert status == 200
+    assert state['table_id'] in registry
+    assert b'set-cookie' not in headers
+    other = asyncio.run(call('POST', '/new-game'))[2]['table_id']
+    assert other != state['table_id']
+    assert asyncio.run(call('POST', '/new-game', {'table_id': other}))[2]['table_id'] == other
+
+def test_action_plays_the_bots_and_returns_a_delta():
+    async def scenario():
+        _, _, state = await call('POST', '/start-game')
+        table_id = state['table_id']
+        status, _, delta = await call('POST', '/action', {'table_id': table_id, 'action': 'call',
+                                                          'since': state['version']})
+        return state, status, delta
+
+    state, status, delta = asyncio.run(scenario())
+    assert status == 200
+    assert delta['since'] == state['version']
+    assert delta['version'] > state['version']
+    assert delta['actions']
+
+def test_unknown_table_and_route():
+    assert asyncio.run(call('GET', '/state', query=b'table_id=missing'))[0] == 404
+    assert asyncio.run(call('GET', '/nowhere'))[0] == 404
+
+def test_malformed_since_is_a_bad_request():
+    table_id = asyncio.run(call('POST', '/new-game'))[2]['table_id']
+    query = f'table_id={table_id}&since=abc'.encode()
+    assert asyncio.run(call('GET', '/state', query=query))[0] == 400
+
+def test_lifespan_startup_configures_logging(monkeypatch):
+    import texas_hold_em_poker_asgi
+    configured = []
+    monkeypatch.setattr(texas_hold_em_poker_asgi, 'configure_logging', lambda: configured.append(True))
+    messages = [{'type': 'lifespan.startup'}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'lifespan.shutdown'}
+
+    async def send(message):
+        sent.append(message['type'])
+
+    monkeypatch.setattr(texas_hold_em_poker_asgi.executor, 'shutdown', lambda wait: None)
+    asyncio.run(app({'type': 'lifespan'}, receive, send))
+    assert configured == [True]
+    assert sent == ['lifespan.startup.complete', 'lifespan.shutdown.complete']
+
+def test_malformed_bet_amount_and_body_are_bad_requests():
+    table_id = asyncio.run(call('POST', '/start-game'))[2]['table_id']
+    assert asyncio.run(call('POST', '/action', {'table_id': table_id, 'action': 'bet', 'betAmount': 'lots'}))[0] == 400
+    assert asyncio.run(call('POST', '/action', [table_id]))[0] == 400
+
+    async def send_raw(body):
+        scope = {'type': 'http', 'method': 'POST', 'path': '/action', 'query_string': b'',
+                 'headers': [(b'content-type', b'application/json')]}
+        messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        await app(scope, receive, send)
+        return sent[0]['status']
+
+    assert asyncio.run(send_raw(b'{not json')) == 400
+
+def test_malformed_seed_is_a_bad_request():
+    assert asyncio.run(call('POST', '/new-game', query=b'seed=x'))[0] == 400
+    assert asyncio.run(call('POST', '/start-game', {'seed': 'x'}))[0] == 400
+
+def test_events_are_streamed_to_async_listeners():
+    async def scenario():
+        _, _, state = await call('POST', '/new-game')
+        table_id = state['table_id']
+        sent = []
+        disconnect = asyncio.Event()
+
+        async def receive():
+            await disconnect.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {'type': 'http', 'method': 'GET', 'path': '/events',
+                 'query_string': f"table_id={table_id}".encode(), 'headers': []}
+        stream = asyncio.ensure_future(app(scope, receive, send))
+        await asyncio.sleep(0.05)
+        await call('POST', '/advance-turn', {'table_id': table_id})
+        for _ in range(100):
+            if len(sent) > 2:
+                break
+            await asyncio.sleep(0.01)
+        disconnect.set()
+        await asyncio.wait_for(stream, 1)
+        return table_id, sent
+
+    table_id, sent = asyncio.run(scenario())
+    assert dict(sent[0]['headers'])[b'content-type'] == b'text/event-stream'
+    assert b'event: turn' in sent[2]['body']
+    assert not registry.get(table_id).listeners
+
+if __name__ == '__main__':
+    pytest.main(["-v", "test_asgi.py"])
@@ -0,0 +1,55 @@
+import sys
+import os
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+np = pytest.importorskip("numpy")
+
+from python_files.deck import Card
+from python_files.hand_evaluator import evaluate
+from python_files.batch_deal import deal_many, seven_card_hands, rank_deals, rank_hole_cards
+from python_files.rng import numpy_generator, sampled_indices
+
+ACES = [Card("Spades", "A"), Card("Hearts", "A")]
+BOARD = [Card("Clubs", "2"), Card("Diamonds", "7"), Card("Hearts", "9")]
+
+def test_deals_are_valid_and_avoid_dead_cards():
+    deals = deal_many(5000, 3, dead_cards=ACES, board=BOARD, generator=numpy_generator(1))
+    assert deals.shape == (5000, 3 * 2 + 5) and deals.dtype == np.int8
+    assert (deals[:, 6:9] == [card.code for card in BOARD]).all()
+    assert all(len(set(row)) == len(row) for row in deals.tolist())
+    assert not np.isin(deals, [card.code for card in ACES]).any()
+
+def test_deals_are_reproducible_and_uniform():
+    first = deal_many(20000, 2, generator=numpy_generator(7), chunk_size=3000)
+    second = deal_many(20000, 2, generator=numpy_generator(7), chunk_size=3000)
+    assert (first == second).all()
+    counts = np.bincount(first.ravel().astype(np.intp), minlength=52)
+    expected = first.size / 52
+    assert counts.min() > expected * 0.9 and counts.max() < expected * 1.1
+
+def test_sampled_indices_rows_have_distinct_values():
+    rows = sampled_indices(1000, 10, 10, numpy_generator(3))
+    assert (np.sort(rows, axis=1) == np.arange(10)).all()
+
+def test_ranks_match_the_scalar_evaluator():
+    deals = deal_many(300, 2, dead_cards=ACES, generator=numpy_generator(5))
+    hands = seven_card_hands(deals, 2)
+    assert rank_deals(deals, 2).tolist() == [[evaluate(list(hand)) for hand in deal] for deal in hands.tolist()]
+    hero = rank_hole_cards(deals, ACES, 2)
+    assert hero.tolist() == [evaluate([card.code for card in ACES] + deal[4:]) for deal in deals.tolist()]
+
+def test_batch_equity_of_aces():
+    deals = deal_many(20000, 1, dead_cards=ACES, generator=numpy_generator(11))
+    hero, opponent = rank_hole_cards(deals, ACES, 1), rank_deals(deals, 1)[:, 0]
+    assert (hero > opponent).mean() + (hero == opponent).mean() / 2 == pytest.approx(0.85, abs=0.02)
+
+def test_deal_many_rejects_impossible_requests():
+    with pytest.raises(ValueError):
+        deal_many(1, 24)
+    with pytest.raises(ValueError):
+        deal_many(1, 2, dead_cards=ACES, board=ACES)
+
+if __name__ == '__main__':
+    pytest.main(["-v", "test_batch_deal.py"])
@@ -0,0 +1,45 @@
+import sys
+import os
+import random
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+np = pytest.importorskip("numpy")
+
+from python_files.deck import Card
+from python_files.hand_evaluator import evaluate
+from python_files.poker_rules import PokerRules
+
+def codes(*cards):
+    return [Card(seed, value).code for value, seed in cards]
+
+EDGE_HANDS = [
+    codes(('10', 'Hearts'), ('J', 'Hearts'), ('Q', 'Hearts'), ('K', 'Hearts'), ('A', 'Hearts'), ('2', 'Clubs'), ('3', 'Clubs')),
+    codes(('A', 'Clubs'), ('2', 'Clubs'), ('3', 'Clubs'), ('4', 'Clubs'), ('5', 'Clubs'), ('6', 'Hearts'), ('K', 'Clubs')),
+    codes(('A', 'Clubs'), ('2', 'Hearts'), ('3', 'Clubs'), ('4', 'Spades'), ('5', 'Clubs'), ('K', 'Hearts'), ('K', 'Clubs')),
+    codes(('9', 'Clubs'), ('9', 'Hearts'), ('9', 'Spades'), ('9', 'Diamonds'), ('3', 'Clubs'), ('3', 'Hearts'), ('3', 'Spades')),
+    codes(('9', 'Clubs'), ('9', 'Hearts'), ('9', 'Spades'), ('3', 'Diamonds'), ('3', 'Clubs'), ('3', 'Hearts'), ('K', 'Spades')),
+    codes(('9', 'Clubs'), ('9', 'Hearts'), ('4', 'Spades'), ('4', 'Diamonds'), ('3', 'Clubs'), ('3', 'Hearts'), ('K', 'Spades')),
+    codes(('9', 'Clubs'), ('9', 'Hearts'), ('4', 'Spades'), ('4', 'Diamonds'), ('2', 'Clubs'), ('2', 'Hearts'), ('3', 'Spades')),
+    codes(('9', 'Clubs'), ('7', 'Clubs'), ('5', 'Clubs'), ('3', 'Clubs'), ('2', 'Clubs'), ('K', 'Clubs'), ('K', 'Hearts')),
+]
+
+def test_rank_many_edge_cases():
+    strengths = PokerRules().rank_many(np.array(EDGE_HANDS))
+    assert strengths.tolist() == [evaluate(hand) for hand in EDGE_HANDS]
+
+@pytest.mark.parametrize("size", [5, 6, 7])
+def test_rank_many_matches_scalar(size):
+    rng = random.Random(size)
+    hands = [rng.sample(range(52), size) for _ in range(3000)]
+    strengths = PokerRules().rank_many(np.array(hands))
+    assert strengths.shape == (len(hands),)
+    assert strengths.tolist() == [evaluate(hand) for hand in hands]
+
+def test_rank_many_rejects_bad_shape():
+    with pytest.raises(ValueError):
+        PokerRules().rank_many(np.zeros((4, 3), dtype=np.int8))
+
+if __name__ == '__main__':
+    pytest.main(["-v", "test_batch_evaluator.py"])
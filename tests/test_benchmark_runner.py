@@ -0,0 +1,27 @@
+import sys
+import os
+import json
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from python_files.benchmark import compare_runs, load_stats
+
+def test_compare_runs_flags_regressions_past_the_threshold():
+    baseline = {'fast': 1.0, 'slow': 1.0, 'only_in_baseline': 1.0}
+    current = {'fast': 0.9, 'slow': 1.3, 'new': 5.0}
+    rows = {name: (ratio, regressed) for name, _, _, ratio, regressed in compare_runs(baseline, current, 0.2)}
+    assert set(rows) == {'fast', 'slow'}
+    assert rows['fast'] == (pytest.approx(0.9), False)
+    assert rows['slow'] == (pytest.approx(1.3), True)
+
+def test_load_stats_reads_pytest_benchmark_json(tmp_path):
+    path = tmp_path / 'run.json'
+    path.write_text(json.dumps({'benchmarks': [
+        {'fullname': 'tests/test_benchmarks.py::test_x', 'stats': {'median': 0.5, 'min': 0.4}}
+    ]}))
+    assert load_stats(path) == {'tests/test_benchmarks.py::test_x': 0.5}
+    assert load_stats(path, 'min') == {'tests/test_benchmarks.py::test_x': 0.4}
+
+if __name__ == '__main__':
+    pytest.main(["-v", "test_benchmark_runner.py"])
@@ -0,0 +1,116 @@
+import sys
+import os
+import json
+import random
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+pytest.importorskip('pytest_benchmark')
+
+from python_files.deck import CARDS, Deck
+from python_files.game import Game
+from python_files.hand_evaluator import clear_seven_tables
+from python_files.players import Bot, BotType
+from python_files.poker_rules import PokerRules
+from python_files.simulation import create_game, play_hand
+
+# Benchmark dei punti caldi del motore (pytest-benchmark), con seed fissi e numero di ripetizioni fisso
+# così che due esecuzioni misurino esattamente lo stesso lavoro. Una normale esecuzione di pytest li salta
+# (vedi tests/conftest.py); per eseguirli, salvare e confrontare i risultati:
+#   python -m pytest tests/test_benchmarks.py --run-benchmarks
+#   python -m python_files.benchmark save
+#   python -m python_files.benchmark compare --threshold 0.15
+
+pytestmark = pytest.mark.benchmark
+
+SEED = 1234
+HANDS = 200
+EQUITY_ITERATIONS = 100
+
+def sample_hands(size, count=HANDS, seed=SEED):
+    rng = random.Random(seed)
+    return [rng.sample(CARDS, size) for _ in range(count)]
+
+# Stato di gioco di un tavolo con i bot, fermo alla fase indicata
+def table_state(phase, seed=SEED):
+    game = Game(headless=True, bot_types=list(BotType), seed=seed)
+    game.setup_players()
+    board_size = {Game.PRE_FLOP: 0, Game.FLOP: 3, Game.TURN: 4, Game.RIVER: 5}[phase]
+    game.community_cards = game.deck.deal(board_size)
+    game.phase = phase
+    return game
+
+def test_calculate_hand_ranking_five_cards(benchmark):
+    rules = PokerRules()
+    hands = sample_hands(5)
+    benchmark.group = 'hand evaluation'
+
+    def rank_all():
+        return [rules.calculate_hand_ranking(hand) for hand in hands]
+
+    assert len(benchmark.pedantic(rank_all, rounds=50, iterations=1)) == HANDS
+
+# Cache delle mani migliori e tabelle di sei/sette carte vuote a ogni ripetizione (cold) oppure già piene (warm)
+@pytest.mark.parametrize('cache', ['cold', 'warm'])
+def test_get_best_hand_seven_cards(benchmark, cache):
+    rules = PokerRules()
+    hands = sample_hands(7)
+    benchmark.group = 'hand evaluation'
+
+    def clear_caches():
+        PokerRules.hand_cache.clear()
+        clear_seven_tables()
+
+    def best_of_all():
+        return [rules.get_best_hand(hand) for hand in hands]
+
+    clear_caches()
+    if cache == 'warm':
+        best_of_all()
+    setup = clear_caches if cache == 'cold' else None
+    assert all(len(best) == 5 for best in benchmark.pedantic(best_of_all, setup=setup, rounds=50))
+
+def test_deck_construction_and_shuffle(benchmark):
+    benchmark.group = 'deck'
+    deck = benchmark.pedantic(Deck, setup=lambda: (('deck.json', random.Random(SEED)), {}), rounds=200)
+    assert len(deck.deck_data) == 52
+
+@pytest.mark.parametrize('phase', [Game.PRE_FLOP, Game.RIVER])
+@pytest.mark.parametrize('bot_type', list(BotType), ids=lambda bot_type: bot_type.name)
+def test_bot_make_decision(benchmark, bot_type, phase):
+    game = table_state(phase)
+    bot = next(player for player in game.players if player.bot_type == bot_type)
+    bot.equity_iterations = EQUITY_ITERATIONS
+    bot.equity_time_budget = None
+    state = game.bot_game_state()
+    benchmark.group = f'bot decision ({phase})'
+
+    def decide():
+        bot.rng = random.Random(SEED)
+        return bot.make_decision(state, phase)
+
+    decision, _ = benchmark.pedantic(decide, rounds=30, iterations=1)
+    assert decision in Game.VALID_ACTIONS
+
+def test_full_headless_hand(benchmark):
+    benchmark.group = 'hand'
+    seeds = iter(range(SEED, SEED + 1000))
+
+    def setup():
+        return (create_game(list(BotType)[:6], EQUITY_ITERATIONS, random.Random(next(seeds))),), {}
+
+    results = benchmark.pedantic(play_hand, setup=setup, rounds=30)
+    assert sum(seat['chip_delta'] for seat in results) == 0
+
+def test_game_state_response_serialization(benchmark):
+    game = table_state(Game.RIVER)
+    benchmark.group = 'state'
+
+    def serialize():
+        return json.dumps(game.generate_game_state_response())
+
+    assert '"phase": "river"' in benchmark.pedantic(serialize, rounds=200, iterations=1)
+
+if __name__ == '__main__':
+    pytest.main(["-v", "test_benchmarks.py"])
@@ -6,7 +6,7 @@ from unittest.mock import mock_open, patch
 # Aggiungi la directory principale del progetto al PYTHONPATH
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from python_files.deck import Card, Deck
+from python_files.deck import Card, Deck, CARDS, card_code, encode_card, canonical_cards, CardStack
 
 def test_create_standard_deck():
     deck = Deck()
@@ -32,11 +32,73 @@ def test_draw_card():
 
 def test_load_deck():
     mock_deck_data = '[{"seed": "Hearts", "value": "2"}, {"seed": "Diamonds", "value": "3"}]'
-    with patch('builtins.open', mock_open(read_data=mock_deck_data)):
-        deck = Deck('deck.json')
-        assert len(deck.deck_data) == 2  # Check if the deck was loaded correctly
-        assert Card('Hearts', '2') in deck.deck_data
-        assert Card('Diamonds', '3') in deck.deck_data
+    canonical_cards.cache_clear()
+    try:
+        with patch('builtins.open', mock_open(read_data=mock_deck_data)):
+            deck = Deck('deck.json')
+            assert len(deck.deck_data) == 2  # Check if the deck was loaded correctly
+            assert Card('Hearts', '2') in deck.deck_data
+            assert Card('Diamonds', '3') in deck.deck_data
+    finally:
+        canonical_cards.cache_clear()
+
+def test_deck_file_is_read_once():
+    Deck()
+    with patch('builtins.open', side_effect=AssertionError("deck.json re-read")):
+        deck = Deck()
+    assert deck.cards is canonical_cards('deck.json')
+    assert deck.deck_data[0] is CARDS[deck.deck_data[0].code]
+
+def test_reset_restores_a_full_reshuffled_deck():
+    deck = Deck()
+    for _ in range(10):
+        deck.draw_card()
+    deck.reset()
+    assert len(deck.deck_data) == 52
+    assert set(deck.deck_data) == set(CARDS)
+
+def test_card_encoding():
+    card = Card('Spades', 'A')
+    assert card.code == encode_card('Spades', 'A')
+    assert Card.from_code(card.code) == card
+    assert CARDS[card.code].value == 'A' and CARDS[card.code].suit == 'Spades'
+    assert len({c.code for c in CARDS}) == 52
+
+def test_card_code_conversions():
+    card = Card('Hearts', '10')
+    assert card_code(card) == card.code
+    assert card_code(card.code) == card.code
+    assert card_code({'value': '10', 'suit': 'hearts'}) == card.code
+    assert card_code({'value': '10', 'seed': 'Hearts'}) == card.code
+
+def test_deal_moves_the_cursor_without_copying_the_deck():
+    deck = Deck()
+    order = list(deck.deck_data)
+    data = deck.deck_data
+    assert deck.deal(2) == order[:2]
+    deck.burn()
+    assert deck.deal_card() == order[3]
+    assert deck.deck_data is data and len(data) == 52
+    assert len(deck) == 48
+    assert list(deck.remaining()) == order[4:]
+    assert deck.remaining()[0] == order[4] and deck.remaining()[-1] == order[-1]
+
+def test_deal_past_the_end_raises():
+    stack = CardStack(range(3))
+    stack.deal(2)
+    with pytest.raises(ValueError):
+        stack.deal(2)
+
+def test_sample_draws_from_the_remaining_cards_only():
+    import random
+    stack = CardStack(range(52))
+    dealt = stack.deal(10)
+    rng = random.Random(7)
+    for _ in range(200):
+        drawn = stack.sample(7, rng)
+        assert len(set(drawn)) == 7
+        assert not set(drawn) & set(dealt)
+    assert stack.position == 10 and sorted(stack.remaining()) == list(range(10, 52))
 
 if __name__ == '__main__':
     pytest.main(["-v", "test_deck.py"])
\ No newline at end of file
@@ -0,0 +1,108 @@
+import sys
+import os
+import time
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from python_files.deck import Card
+from python_files.equity import equity
+from python_files.players import Bot, BotType, BettingRound
+
+ACES = [Card("Hearts", "A"), Card("Spades", "A")]
+
+def test_equity_pocket_aces_heads_up():
+    result = equity(ACES, num_opponents=1, iterations=4000, seed=1)
+    assert result['iterations'] == 4000
+    assert abs(result['win'] + result['tie'] + result['loss'] - 1.0) < 1e-9
+    assert 0.82 < result['win'] < 0.88
+
+def test_equity_is_reproducible_with_seed():
+    first = equity(ACES, num_opponents=3, iterations=500, seed=42)
+    second = equity(ACES, num_opponents=3, iterations=500, seed=42)
+    assert first == second
+
+def test_equity_royal_flush_on_board_always_ties():
+    board = [Card("Clubs", "10"), Card("Clubs", "J"), Card("Clubs", "Q"), Card("Clubs", "K"), Card("Clubs", "A")]
+    result = equity([Card("Hearts", "2"), Card("Diamonds", "3")], board, num_opponents=2, iterations=200, seed=3)
+    assert result['tie'] == 1.0
+
+def test_equity_parallel_is_reproducible():
+    first = equity(ACES, num_opponents=1, iterations=1001, seed=8, workers=2)
+    second = equity(ACES, num_opponents=1, iterations=1001, seed=8, workers=2)
+    assert first == second
+    assert first['iterations'] == 1001
+    assert 0.8 < first['win'] < 0.9
+
+def test_equity_time_budget_stops_early():
+    result = equity(ACES, num_opponents=9, iterations=10**7, seed=5, time_budget=0.01)
+    assert 0 < result['iterations'] < 10**7
+
+def test_equity_exact_mode_on_river():
+    board = [Card("Clubs", "2"), Card("Hearts", "7"), Card("Diamonds", "K"), Card("Spades", "9"), Card("Clubs", "3")]
+    hole = [Card("Hearts", "A"), Card("Spades", "K")]
+    result = equity(hole, board, num_opponents=1, mode='exact')
+    assert result['mode'] == 'exact'
+    assert result['iterations'] == 990  # C(45, 2) mani avversarie
+    assert equity(hole, board, num_opponents=1, iterations=1000)['mode'] == 'exact'
+    assert equity(hole, board[:3], num_opponents=1, iterations=1000)['mode'] == 'sampled'
+
+def test_equity_exact_matches_sampled_on_turn():
+    board = [Card("Clubs", "2"), Card("Hearts", "7"), Card("Diamonds", "K"), Card("Spades", "9")]
+    hole = [Card("Hearts", "A"), Card("Spades", "K")]
+    exact = equity(hole, board, num_opponents=1, mode='exact')
+    sampled = equity(hole, board, num_opponents=1, iterations=3000, seed=4, mode='sampled')
+    assert exact['iterations'] == 46 * 990
+    assert abs(exact['win'] - sampled['win']) < 0.03
+
+def test_exact_mode_respects_the_time_budget():
+    board = [Card("Clubs", "2"), Card("Hearts", "7"), Card("Diamonds", "K")]
+    hole = [Card("Hearts", "A"), Card("Spades", "K")]
+    start = time.perf_counter()
+    result = equity(hole, board, num_opponents=2, seed=6, time_budget=0.05, mode='exact')
+    assert time.perf_counter() - start < 0.5
+    assert result['mode'] == 'sampled' and result['iterations'] > 0
+    river = board + [Card("Spades", "9"), Card("Clubs", "3")]
+    assert equity(hole, river, num_opponents=1, time_budget=1.0, mode='exact')['mode'] == 'exact'
+    assert equity(hole, river, num_opponents=2, time_budget=60.0, mode='exact')['iterations'] == 990 * 903 // 2
+
+def test_equity_dead_cards_are_excluded():
+    board = [Card("Clubs", "2"), Card("Hearts", "7"), Card("Diamonds", "K"), Card("Spades", "9"), Card("Clubs", "3")]
+    result = equity(ACES, board, num_opponents=1, mode='exact', dead_cards=[Card("Clubs", "A")])
+    assert result['iterations'] == 946  # C(44, 2)
+
+def test_equity_rejects_invalid_input():
+    with pytest.raises(ValueError):
+        equity(ACES[:1])
+    with pytest.raises(ValueError):
+        equity(ACES, num_opponents=10)
+    with pytest.raises(ValueError):
+        equity(ACES, [Card("Hearts", "A")])
+    with pytest.raises(ValueError):
+        equity(ACES, mode='guess')
+
+def test_bot_estimate_equity():
+    bot = Bot("TestBot", BotType.AGGRESSIVE)
+    for card in ACES:
+        bot.add_card(card)
+    result = bot.estimate_equity([], 1)
+    assert 0 < result['iterations'] <= bot.equity_iterations
+
+def test_bot_folds_river_without_equity():
+    bot = Bot("TestBot", BotType.TIGHT)
+    bot.add_card(Card("Hearts", "2"))
+    bot.add_card(Card("Diamonds", "3"))
+    game_state = {
+        'community_cards': [Card("Clubs", "A"), Card("Clubs", "K"), Card("Spades", "Q"), Card("Diamonds", "9"), Card("Hearts", "8")],
+        'current_bet': 100,
+        'pot': 100,
+        'players': [bot, {'name': 'player', 'aggressiveness': 0}],
+        'dealer_index': 0
+    }
+    assert bot.estimate_equity(game_state['community_cards'], 1)['mode'] == 'exact'
+    assert bot.late_street_equity(game_state) < 0.5
+    decision, _ = bot.make_decision(game_state, BettingRound.RIVER)
+    assert decision == 'fold'
+
+if __name__ == '__main__':
+    pytest.main(["-v", "test_equity.py"])
@@ -0,0 +1,150 @@
+import sys
+import os
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from python_files.events import EventBus, TURN, ACTION, PHASE, STATE, DEAL
+from python_files.game import Game
+from python_files.players import BotType, Bot
+
+def test_publish_reaches_subscribers_until_unsubscribed():
+    bus = EventBus()
+    received = []
+    callback = bus.subscribe(received.append)
+    bus.publish(TURN, {'current_turn': 'player'})
+    bus.unsubscribe(callback)
+    bus.publish(TURN, {'current_turn': 'Bot1'})
+    assert received == [{'type': TURN, 'data': {'current_turn': 'player'}}]
+    assert not bus.has_subscribers()
+
+def test_game_publishes_actions_turns_and_phases():
+    game = Game(bot_types=[BotType.CALLING_STATION, BotType.PASSIVE])
+    events = []
+    game.events.subscribe(events.append)
+    game.setup_players()
+    for player in list(game.players):
+        game.execute_turn(player, 'call')
+
+    types = [event['type'] for event in events]
+    assert types[0] == DEAL
+    assert types.count(ACTION) == 2
+    assert TURN in types
+    assert PHASE in types
+    assert events[1]['data']['player'] == game.players[0].name
+
+def test_state_is_published_only_to_subscribers():
+    game = Game(bot_types=[BotType.PASSIVE, BotType.TIGHT])
+    game.setup_players()
+    game.publish_state()
+    events = []
+    game.events.subscribe(events.append)
+    game.publish_state()
+    assert [event['type'] for event in events] == [STATE]
+    assert events[0]['data']['pot'] == game.pot
+
+def test_flask_responses_carry_table_events():
+    pytest.importorskip('flask')
+    from texas_hold_em_poker import app
+
+    client = app.test_client()
+    table = {'table_id': client.post('/new-game').get_json()['table_id']}
+    response = client.post('/advance-turn', json=table).get_json()
+    assert any(event['type'] == TURN for event in response['events'])
+    assert client.post('/advance-turn', json=table).get_json()['events'][0]['type'] == TURN
+
+def test_bots_play_until_the_human_turn():
+    game = Game(num_players=4)
+    game.setup_players()
+    game.play_bot_turns()
+    assert game.phase == Game.SHOWDOWN or not isinstance(game.turn_manager.get_current_player(), Bot)
+
+def test_table_events_are_streamed():
+    pytest.importorskip('flask')
+    from texas_hold_em_poker import app
+
+    client = app.test_client()
+    table = {'table_id': client.post('/new-game').get_json()['table_id']}
+    stream = client.get('/events', query_string=table, buffered=False)
+    assert stream.mimetype == 'text/event-stream'
+    chunks = iter(stream.response)
+    assert next(chunks).startswith(b'retry:')
+    client.post('/advance-turn', json=table)
+    message = next(chunks).decode()
+    assert message.startswith('id: ') and '\nevent: turn\n' in message
+    stream.close()
+
+def test_invalid_bet_leaves_the_table_untouched():
+    game = Game(num_players=3, headless=True, seed=1)
+    game.setup_players()
+    player = game.turn_manager.get_current_player()
+    before = (game.pot, len(game.players_actions), len(game.action_log), game.turn_manager.current_turn)
+    assert 'cannot bet' in game.execute_turn(player, 'bet', 0)
+    assert 'cannot raise' in game.execute_turn(player, 'raise', -5)
+    assert (game.pot, len(game.players_actions), len(game.action_log), game.turn_manager.current_turn) == before
+
+def test_action_of_a_player_no_longer_seated_is_logged():
+    game = Game(num_players=3, headless=True, seed=1)
+    game.setup_players()
+    events = []
+    game.events.subscribe(events.append)
+    assert game.execute_turn({'name': 'ghost'}, 'call') == 'ghost: call'
+    assert events[0]['type'] == ACTION and events[0]['data']['message'] == 'ghost: call'
+
+def test_state_delta_contains_only_changes():
+    game = Game(bot_types=[BotType.CALLING_STATION, BotType.PASSIVE, BotType.TIGHT])
+    game.setup_players()
+    full = game.generate_game_state_response()
+    since = full['version']
+
+    assert game.generate_state_delta(since)['actions'] == []
+    first = game.players[0]
+    game.execute_turn(first, 'bet', 50)
+    delta = game.generate_state_delta(since)
+    assert [entry['player'] for entry in delta['actions']] == [first.name]
+    assert [player['name'] for player in delta['players']] == [first.name]
+    assert delta['new_community_cards'] == []
+    assert delta['version'] > since
+
+    for player in list(game.players[1:]):
+        game.execute_turn(player, 'call')
+    assert game.phase == Game.FLOP
+    delta = game.generate_state_delta(delta['version'])
+    assert len(delta['new_community_cards']) == 3
+    assert len(delta['actions']) == 2
+
+def test_unknown_version_returns_full_state():
+    game = Game(bot_types=[BotType.PASSIVE, BotType.TIGHT])
+    game.setup_players()
+    assert 'bot_actions' in game.generate_state_delta(game.state_version + 10)
+
+def test_state_route_honours_since():
+    pytest.importorskip('flask')
+    from texas_hold_em_poker import app
+
+    client = app.test_client()
+    state = client.post('/new-game').get_json()
+    version = state['version']
+    delta = client.get('/state', query_string={'since': version, 'table_id': state['table_id']}).get_json()
+    assert delta['since'] == version
+    assert 'bot_actions' not in delta
+    assert client.get('/state', query_string={'since': 'abc', 'table_id': state['table_id']}).status_code == 400
+
+def test_new_hand_at_same_table_continues_versions():
+    pytest.importorskip('flask')
+    from texas_hold_em_poker import app
+
+    client = app.test_client()
+    first = client.post('/start-game').get_json()
+    table = {'table_id': first['table_id']}
+    client.post('/action', json={**table, 'action': 'call'})
+    stale = client.get('/state', query_string=table).get_json()['version']
+    second = client.post('/new-game', json=table).get_json()
+    assert second['table_id'] == first['table_id']
+    assert second['version'] > stale
+    # Un since della mano precedente produce lo stato completo della nuova partita, non differenze
+    response = client.get('/state', query_string={**table, 'since': stale}).get_json()
+    assert 'since' not in response and 'community_cards' in response
+
+if __name__ == '__main__':
+    pytest.main(["-v", "test_events.py"])
@@ -0,0 +1,89 @@
+import sys
+import os
+import random
+from collections import Counter
+from itertools import combinations, combinations_with_replacement
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from python_files.deck import Card
+from python_files.hand_evaluator import (
+    FLUSH_TABLE, UNIQUE5_TABLE, PRIME_TABLE, PRIMES, evaluate, evaluate_best, evaluate_five, hand_category, HandState,
+    RANK_KEYS, FLUSH_KEYS, RANK_STRENGTHS, FLUSH_STRENGTHS, clear_seven_tables,
+    ROYAL_FLUSH, STRAIGHT_FLUSH, FULL_HOUSE, STRAIGHT, TWO_PAIRS, PAIR, HIGH_CARD
+)
+
+def codes(*cards):
+    return [Card(seed, value).code for value, seed in cards]
+
+def count_factors(product):
+    count = 0
+    for prime in PRIMES:
+        while product % prime == 0:
+            product //= prime
+            count += 1
+    return count
+
+def test_distinct_five_card_strengths():
+    strengths = {s for s in FLUSH_TABLE if s} | {s for s in UNIQUE5_TABLE if s}
+    strengths |= {strength for product, strength in PRIME_TABLE.items() if count_factors(product) == 5}
+    assert len(strengths) == 7462  # Numero di classi di equivalenza delle mani da 5 carte
+
+def test_categories():
+    assert hand_category(evaluate_five(codes(('10', 'Hearts'), ('J', 'Hearts'), ('Q', 'Hearts'), ('K', 'Hearts'), ('A', 'Hearts')))) == ROYAL_FLUSH
+    assert hand_category(evaluate_five(codes(('A', 'Clubs'), ('2', 'Clubs'), ('3', 'Clubs'), ('4', 'Clubs'), ('5', 'Clubs')))) == STRAIGHT_FLUSH
+    assert hand_category(evaluate_five(codes(('A', 'Clubs'), ('2', 'Hearts'), ('3', 'Clubs'), ('4', 'Clubs'), ('5', 'Clubs')))) == STRAIGHT
+    assert hand_category(evaluate_five(codes(('8', 'Clubs'), ('8', 'Hearts'), ('8', 'Spades'), ('K', 'Clubs'), ('K', 'Hearts')))) == FULL_HOUSE
+    assert hand_category(evaluate(codes(('A', 'Clubs'), ('A', 'Hearts')))) == PAIR
+    assert hand_category(evaluate(codes(('A', 'Clubs'), ('K', 'Hearts')))) == HIGH_CARD
+
+def test_kickers_break_ties():
+    aces_up = evaluate_five(codes(('A', 'Clubs'), ('A', 'Hearts'), ('3', 'Spades'), ('3', 'Clubs'), ('7', 'Hearts')))
+    threes_up = evaluate_five(codes(('4', 'Clubs'), ('4', 'Hearts'), ('3', 'Spades'), ('3', 'Hearts'), ('K', 'Hearts')))
+    assert hand_category(aces_up) == hand_category(threes_up) == TWO_PAIRS
+    assert aces_up > threes_up
+    wheel = evaluate_five(codes(('A', 'Clubs'), ('2', 'Hearts'), ('3', 'Clubs'), ('4', 'Clubs'), ('5', 'Clubs')))
+    six_high = evaluate_five(codes(('6', 'Clubs'), ('2', 'Hearts'), ('3', 'Clubs'), ('4', 'Clubs'), ('5', 'Clubs')))
+    assert six_high > wheel
+
+def test_suit_permutation_invariance():
+    rng = random.Random(7)
+    for _ in range(200):
+        hand = rng.sample(range(52), 5)
+        swapped = [(code & ~3) | ((code & 3) ^ 1) for code in hand]
+        assert evaluate_five(hand) == evaluate_five(swapped)
+
+def test_evaluate_best_matches_exhaustive_search():
+    rng = random.Random(11)
+    for _ in range(500):
+        hand = rng.sample(range(52), 7)
+        strength, best = evaluate_best(hand)
+        assert strength == max(evaluate_five(five) for five in combinations(hand, 5))
+        assert len(set(best)) == 5 and set(best) <= set(hand)
+        assert evaluate_five(best) == strength
+
+def test_hand_state_grows_street_by_street():
+    rng = random.Random(12)
+    for _ in range(500):
+        cards = rng.sample(range(52), 7)
+        state = HandState.from_codes(cards[:2])
+        assert state.strength() == evaluate(cards[:2])
+        for size in range(3, 8):
+            state = state.add(cards[size - 1])
+            assert state.strength() == evaluate(cards[:size])
+
+def test_seven_card_tables_are_bounded():
+    rank_keys = sum(1 for size in (6, 7) for ranks in combinations_with_replacement(range(13), size)
+                    if max(Counter(ranks).values()) <= 4)
+    flush_keys = sum(1 for size in (5, 6, 7) for _ in combinations(range(13), size))
+    assert (rank_keys, flush_keys) == (RANK_KEYS, FLUSH_KEYS)
+
+    clear_seven_tables()
+    rng = random.Random(13)
+    for _ in range(2000):
+        evaluate(rng.sample(range(52), 7))
+    assert 0 < len(RANK_STRENGTHS) <= RANK_KEYS and 0 < len(FLUSH_STRENGTHS) <= FLUSH_KEYS
+
+if __name__ == '__main__':
+    pytest.main(["-v", "test_hand_evaluator.py"])
@@ -0,0 +1,53 @@
+import sys
+import os
+import json
+import logging
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from python_files.logging_config import configure_logging, parse_module_levels, JsonFormatter
+from python_files.game import Game
+from python_files.players import BotType
+from python_files.simulation import play_hand
+
+@pytest.fixture
+def restore_logging():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield
+    root.handlers[:] = handlers
+    root.setLevel(level)
+    for name in ('python_files.game', 'python_files.players'):
+        logging.getLogger(name).setLevel(logging.NOTSET)
+
+def test_parse_module_levels():
+    assert parse_module_levels('python_files.game=debug, python_files.players=INFO') == {
+        'python_files.game': 'DEBUG', 'python_files.players': 'INFO'
+    }
+    assert parse_module_levels(None) == {}
+
+def test_quiet_by_default(restore_logging, monkeypatch):
+    monkeypatch.delenv('POKER_LOG_LEVEL', raising=False)
+    monkeypatch.delenv('POKER_LOG_LEVELS', raising=False)
+    root = configure_logging()
+    assert root.level == logging.WARNING
+    assert not logging.getLogger('python_files.game').isEnabledFor(logging.DEBUG)
+
+def test_module_levels_override_the_default(restore_logging):
+    configure_logging('WARNING', {'python_files.game': 'DEBUG'})
+    assert logging.getLogger('python_files.game').isEnabledFor(logging.DEBUG)
+    assert not logging.getLogger('python_files.players').isEnabledFor(logging.DEBUG)
+
+def test_json_formatter():
+    record = logging.LogRecord('python_files.game', logging.INFO, __file__, 1, "%s wins", ('Bot1',), None)
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry['message'] == 'Bot1 wins'
+    assert entry['logger'] == 'python_files.game'
+
+def test_engine_does_not_write_to_stdout(capsys):
+    play_hand(Game(headless=True, bot_types=[BotType.CALLING_STATION, BotType.MANIAC]))
+    assert capsys.readouterr().out == ''
+
+if __name__ == '__main__':
+    pytest.main(["-v", "test_logging_config.py"])
@@ -0,0 +1,62 @@
+import sys
+import os
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from python_files import metrics
+from python_files.game import Game
+from python_files.players import BotType
+from python_files.simulation import play_hand
+
+@pytest.fixture
+def enabled_metrics():
+    metrics.reset()
+    metrics.enable()
+    yield
+    metrics.disable()
+    metrics.reset()
+
+def test_histogram_buckets_are_cumulative():
+    histogram = metrics.Histogram('poker_test_seconds', 'test', buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value)
+    samples = {name + labels: value for name, labels, value in histogram.samples()}
+    assert samples['poker_test_seconds_bucket{le="0.1"}'] == 1
+    assert samples['poker_test_seconds_bucket{le="1.0"}'] == 3
+    assert samples['poker_test_seconds_bucket{le="+Inf"}'] == 4
+    assert samples['poker_test_seconds_count'] == 4
+    assert samples['poker_test_seconds_sum'] == pytest.approx(4.05)
+
+def test_disabled_metrics_record_nothing():
+    metrics.disable()
+    metrics.reset()
+    play_hand(Game(headless=True, bot_types=[BotType.CALLING_STATION, BotType.MANIAC]))
+    assert 'poker_execute_turn_seconds_count 0' in metrics.render()
+
+def test_engine_phases_are_timed(enabled_metrics):
+    play_hand(Game(headless=True, bot_types=[BotType.CALLING_STATION, BotType.MANIAC]))
+    text = metrics.render({'live_tables': ("Tables", 3)})
+    for name in ('execute_turn', 'bot_decision', 'best_hand'):
+        count = next(line for line in text.splitlines() if line.startswith(f'poker_{name}_seconds_count'))
+        assert int(count.split()[1]) > 0
+    assert '# TYPE poker_execute_turn_seconds histogram' in text
+    assert 'poker_hands_completed_total 1' in text
+    assert 'poker_live_tables 3' in text
+
+def test_metrics_route(enabled_metrics):
+    pytest.importorskip('flask')
+    from texas_hold_em_poker import app
+
+    client = app.test_client()
+    client.post('/new-game')
+    response = client.get('/metrics')
+    assert response.content_type.startswith('text/plain')
+    body = response.get_data(as_text=True)
+    assert 'poker_state_response_seconds_count' in body
+    assert 'poker_json_serialization_seconds_count 1' in body
+    assert 'poker_live_tables' in body
+    assert 'poker_hand_cache_hits' in body
+
+if __name__ == '__main__':
+    pytest.main(["-v", "test_metrics.py"])
@@ -7,6 +7,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from python_files.players import Player, Dealer, Bot, BotType, BettingRound
 from python_files.deck import Card
+from python_files.poker_rules import PokerRules
 
 # Test per la classe Player
 def test_player_add_card():
@@ -67,6 +68,34 @@ def test_dealer_determine_winner():
     winner = dealer.determine_winner([player1, player2], game_state)
     assert winner == player1
 
+def test_dealer_determine_winner_uses_kickers():
+    dealer = Dealer()
+    player1 = Player("Player1")
+    player2 = Player("Player2")
+    player1.add_card(Card("Hearts", "3"))
+    player1.add_card(Card("Diamonds", "3"))
+    player2.add_card(Card("Clubs", "A"))
+    player2.add_card(Card("Spades", "A"))
+    game_state = {'community_cards': [Card("Hearts", "K"), Card("Clubs", "K"), Card("Spades", "7"), Card("Diamonds", "8"), Card("Hearts", "2")]}
+    assert dealer.determine_winner([player1, player2], game_state) == player2
+
+def test_dealer_split_pot():
+    dealer = Dealer()
+    player1 = Player("Player1")
+    player2 = Player("Player2")
+    player1.add_card(Card("Hearts", "2"))
+    player1.add_card(Card("Diamonds", "3"))
+    player2.add_card(Card("Clubs", "2"))
+    player2.add_card(Card("Spades", "3"))
+    game_state = {'pot': 101, 'community_cards': [Card("Hearts", "A"), Card("Clubs", "K"), Card("Spades", "Q"), Card("Diamonds", "J"), Card("Hearts", "10")]}
+    winners = dealer.determine_winners([player1, player2], game_state)
+    assert winners == [player1, player2]
+    chips = player1.get_chips()
+    dealer.split_pot(winners, game_state)
+    assert player1.get_chips() == chips + 51
+    assert player2.get_chips() == chips + 50
+    assert game_state['pot'] == 0
+
 # Test per la classe Bot
 @pytest.mark.parametrize("bot_type", BotType)
 def test_bot_make_decision(bot_type):
@@ -113,5 +142,27 @@ def test_bot_evaluate_table_position():
     position = bot.evaluate_table_position(game_state)
     assert position == 'small blind'
 
+def test_hand_strength_is_cached_per_street():
+    player = Player("Player1")
+    player.cards = [Card('Hearts', 'A'), Card('Spades', 'A')]
+    flop = [Card('Clubs', 'A'), Card('Hearts', '7'), Card('Diamonds', '2')]
+    state = player.hand_state(flop)
+    assert player.hand_state(flop) is state
+    turn = flop + [Card('Spades', '7')]
+    extended = player.hand_state(turn)
+    assert extended.codes[:5] == state.codes and len(extended.codes) == 6
+    assert player.hand_strength(turn) == PokerRules().hand_strength(player.cards + turn)
+    assert player.evaluate_hand(turn) == PokerRules().calculate_hand_ranking(player.cards + turn)
+
+def test_hand_strength_cache_follows_new_hole_cards():
+    player = Player("Player1")
+    board = [Card('Clubs', 'K'), Card('Hearts', '7'), Card('Diamonds', '2')]
+    player.cards = [Card('Hearts', 'K'), Card('Spades', 'K')]
+    trips = player.evaluate_hand(board)
+    player.cards = [Card('Hearts', '3'), Card('Spades', '9')]
+    assert player.evaluate_hand(board) < trips
+    player.clear_hand_state()
+    assert player.strength_cache is None
+
 if __name__ == '__main__':
     pytest.main(["-v", "test_players.py"])
\ No newline at end of file
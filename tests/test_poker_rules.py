@@ -93,6 +93,19 @@ def test_determine_winner(poker_rules, sample_hands):
     result = poker_rules.determine_winner(player_hand, opponent_hand, community_cards)
     assert "wins" in result
 
+def test_determine_winner_tie(poker_rules):
+    player_hand = [Card('2', 'hearts'), Card('3', 'clubs')]
+    opponent_hand = [Card('2', 'spades'), Card('3', 'diamonds')]
+    community_cards = [Card('A', 'hearts'), Card('K', 'clubs'), Card('Q', 'spades'), Card('J', 'diamonds'), Card('10', 'hearts')]
+    result = poker_rules.determine_winner(player_hand, opponent_hand, community_cards)
+    assert "tie" in result
+
+def test_hand_strength_orders_kickers(poker_rules, sample_hands):
+    two_pairs = sample_hands['two_pairs']
+    better = [Card('A', 'hearts'), Card('A', 'diamonds'), Card('J', 'clubs'), Card('J', 'spades'), Card('2', 'clubs')]
+    assert poker_rules.calculate_hand_ranking(better) == poker_rules.calculate_hand_ranking(two_pairs)
+    assert poker_rules.hand_strength(better) > poker_rules.hand_strength(two_pairs)
+
 def test_get_best_hand(poker_rules, sample_hands):
     cards = sample_hands['royal_flush'] + sample_hands['high_card'][:2]
     best_hand = poker_rules.get_best_hand(cards)
@@ -107,5 +120,48 @@ def test_get_hand_explanation(poker_rules, sample_hands):
     explanation = poker_rules.get_hand_explanation(hand)
     assert "Royal Flush" in explanation
 
+def test_best_hand_cache_maps_suit_isomorphic_hands(poker_rules):
+    from python_files.poker_rules import HandCache
+    poker_rules.hand_cache = HandCache(maxsize=8)
+    hearts = [Card('A', 'Hearts'), Card('K', 'Hearts'), Card('Q', 'Hearts'), Card('J', 'Hearts'),
+              Card('9', 'Hearts'), Card('2', 'Clubs'), Card('3', 'Spades')]
+    clubs = [Card(card.value, {'Hearts': 'Clubs', 'Clubs': 'Diamonds', 'Spades': 'Hearts'}[card.suit]) for card in hearts]
+    first_strength, first_best = poker_rules.evaluate_best_hand(hearts)
+    strength, best = poker_rules.evaluate_best_hand(clubs)
+    assert strength == first_strength
+    assert [(card.value, card.suit) for card in best] == [(card.value, 'Clubs') for card in first_best]
+    assert poker_rules.hand_cache.stats()['hits'] == 1 and poker_rules.hand_cache.stats()['misses'] == 1
+
+def test_hand_cache_evicts_least_recently_used():
+    from python_files.poker_rules import HandCache
+    cache = HandCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None and cache.get('a') == 1 and cache.get('c') == 3
+    assert cache.stats() == {'hits': 3, 'misses': 1, 'size': 2, 'maxsize': 2, 'hit_rate': 0.75}
+    cache.resize(1)
+    assert cache.stats()['size'] == 1 and cache.get('c') == 3
+
+def test_hand_cache_is_thread_safe():
+    import random
+    from concurrent.futures import ThreadPoolExecutor
+    from python_files.poker_rules import PokerRules, HandCache
+    from python_files.deck import CARDS
+    from python_files.hand_evaluator import evaluate
+    rules = PokerRules()
+    rules.hand_cache = HandCache(maxsize=50)
+    hands = [random.Random(seed).sample(CARDS, 7) for seed in range(200)]
+
+    def check(hand):
+        strength, best = rules.evaluate_best_hand(hand)
+        return strength == evaluate([card.code for card in hand]) and set(best) <= set(hand)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert all(pool.map(check, hands * 5))
+    stats = rules.hand_cache.stats()
+    assert stats['hits'] + stats['misses'] == 1000 and stats['size'] <= 50
+
 if __name__ == "__main__":
     pytest.main(['-k', 'test_poker_rules'])
\ No newline at end of file
@@ -0,0 +1,66 @@
+import sys
+import os
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from python_files.deck import Card
+from python_files.players import Bot, BotType
+from python_files.preflop_table import canonical_hand, canonical_hands, load_table, preflop_equity, representative_cards
+
+def test_canonical_hand():
+    assert canonical_hand([Card("Hearts", "A"), Card("Spades", "A")]) == 'AA'
+    assert canonical_hand([Card("Hearts", "K"), Card("Hearts", "A")]) == 'AKs'
+    assert canonical_hand([Card("Clubs", "2"), Card("Hearts", "7")]) == '72o'
+    assert canonical_hand([Card("Clubs", "10"), Card("Clubs", "J")]) == 'JTs'
+
+def test_canonical_hands_are_169():
+    hands = canonical_hands()
+    assert len(hands) == len(set(hands)) == 169
+    for hand in hands:
+        assert canonical_hand(representative_cards(hand)) == hand
+
+def test_table_covers_every_hand_and_opponent_count():
+    table = load_table()
+    assert set(table) == set(canonical_hands())
+    assert all(len(shares) == 9 for shares in table.values())
+
+# Mani che dominano altre mani (stessa carta alta con kicker migliore, coppia più alta, suited contro offsuit)
+# devono avere un'equity almeno pari contro qualunque numero di avversari
+DOMINANCE = [
+    ('AA', 'KK'), ('KK', 'QQ'), ('QQ', 'JJ'), ('JJ', 'TT'),
+    ('AKs', 'AQs'), ('AQs', 'AJs'), ('AJs', 'ATs'), ('AKo', 'AQo'), ('AQo', 'AJo'),
+    ('KQs', 'KJs'), ('AQs', 'KQs'), ('AKs', 'AKo'), ('AQs', 'AQo'), ('KQs', 'KQo')
+]
+
+def test_table_respects_dominance_for_every_opponent_count():
+    table = load_table()
+    for better, worse in DOMINANCE:
+        for num_opponents in range(9):
+            assert table[better][num_opponents] >= table[worse][num_opponents], (better, worse, num_opponents + 1)
+
+def test_preflop_equity_lookup():
+    aces = [Card("Hearts", "A"), Card("Spades", "A")]
+    seven_deuce = [Card("Clubs", "2"), Card("Hearts", "7")]
+    assert 0.82 < preflop_equity(aces, 1) < 0.88
+    for num_opponents in range(1, 10):
+        assert preflop_equity(aces, num_opponents) > preflop_equity(seven_deuce, num_opponents)
+    assert preflop_equity(aces, 1) > preflop_equity(aces, 9)
+
+def test_bot_pre_flop_decision_uses_table():
+    bot = Bot("TestBot", BotType.TIGHT)
+    bot.add_card(Card("Clubs", "2"))
+    bot.add_card(Card("Hearts", "7"))
+    game_state = {
+        'community_cards': [],
+        'current_bet': 100,
+        'pot': 100,
+        'players': [bot, {'name': 'player', 'aggressiveness': 0}],
+        'dealer_index': 0
+    }
+    assert bot.pre_flop_equity(game_state) == preflop_equity(bot.cards, 1)
+    decision, _ = bot.make_decision(game_state, 'pre-flop')
+    assert decision == 'fold'
+
+if __name__ == '__main__':
+    pytest.main(["-v", "test_preflop_table.py"])
@@ -0,0 +1,72 @@
+import sys
+import os
+import random
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from python_files.game import Game
+from python_files.players import BotType
+from python_files.deck import Deck, CARDS
+from python_files.rng import make_rng, spawn, numpy_generator, shuffled_indices
+
+BOT_MIX = [BotType.AGGRESSIVE, BotType.TIGHT, BotType.BLUFFER]
+
+# Carte e parametri casuali di una partita appena distribuita
+def dealt(game):
+    game.setup_players()
+    game.play_bot_turns()
+    return ([(player.name, player.cards) for player in game.players], game.small_blind,
+            [player.aggressiveness for player in game.players], list(game.players_actions))
+
+def test_same_table_seed_replays_the_hand():
+    assert dealt(Game(headless=True, bot_types=BOT_MIX, seed=11)) == dealt(Game(headless=True, bot_types=BOT_MIX, seed=11))
+    assert dealt(Game(headless=True, bot_types=BOT_MIX, seed=11)) != dealt(Game(headless=True, bot_types=BOT_MIX, seed=12))
+
+def test_seeded_game_leaves_the_global_generator_alone():
+    random.seed(5)
+    expected = random.random()
+    random.seed(5)
+    dealt(Game(headless=True, bot_types=BOT_MIX, seed=1))
+    assert random.random() == expected
+
+def test_streams_are_derived_per_component():
+    game = Game(headless=True, bot_types=BOT_MIX, seed=3)
+    streams = [game.rng, game.deck.rng] + [bot.rng for bot in game.players]
+    assert len({id(stream) for stream in streams}) == len(streams)
+    assert spawn(random) is random and make_rng() is random
+
+def test_deck_accepts_a_numpy_generator():
+    pytest.importorskip('numpy')
+    first, second = Deck(rng=numpy_generator(9)), Deck(rng=numpy_generator(9))
+    assert first.deck_data == second.deck_data
+    assert set(first.deck_data) == set(CARDS)
+
+def test_shuffled_indices_are_independent_permutations():
+    np = pytest.importorskip('numpy')
+    decks = shuffled_indices(1000, generator=numpy_generator(4))
+    assert decks.shape == (1000, 52)
+    assert (np.sort(decks, axis=1) == np.arange(52)).all()
+    assert len({row.tobytes() for row in decks}) == 1000
+    assert (shuffled_indices(10, generator=numpy_generator(4)) == shuffled_indices(10, generator=numpy_generator(4))).all()
+
+def test_flask_new_game_with_seed_is_replayable():
+    pytest.importorskip('flask')
+    from texas_hold_em_poker import app
+
+    client = app.test_client()
+    first = client.post('/new-game', json={'seed': 21}).get_json()
+    second = client.post('/new-game', json={'seed': 21}).get_json()
+    assert first['player_hand'] == second['player_hand']
+    assert first['players'] == second['players']
+
+def test_malformed_seed_is_a_bad_request():
+    pytest.importorskip('flask')
+    from texas_hold_em_poker import app
+
+    client = app.test_client()
+    assert client.post('/new-game', query_string={'seed': 'x'}).status_code == 400
+    assert client.post('/start-game', json={'seed': 'x'}).status_code == 400
+
+if __name__ == '__main__':
+    pytest.main(["-v", "test_rng.py"])
@@ -0,0 +1,86 @@
+import sys
+import os
+import random
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from python_files.game import Game
+from python_files.players import BotType
+from python_files.simulation import simulate, play_hand, play_hands, create_game
+from python_files.tournament import league_tables, run_league
+
+BOT_MIX = [BotType.AGGRESSIVE, BotType.TIGHT, BotType.MANIAC, BotType.CALLING_STATION]
+
+def test_headless_game_has_only_bots():
+    game = Game(headless=True, bot_types=BOT_MIX)
+    assert len(game.players) == len(BOT_MIX)
+    assert sorted(player.bot_type.name for player in game.players) == sorted(bot_type.name for bot_type in BOT_MIX)
+
+def test_play_hand_conserves_chips():
+    results = play_hand(create_game(BOT_MIX, 20))
+    assert len(results) == len(BOT_MIX)
+    assert sum(seat['chip_delta'] for seat in results) == 0
+    assert sum(seat['won'] for seat in results) == pytest.approx(1.0)
+
+def test_simulate_is_reproducible():
+    first = simulate(20, BOT_MIX, seed=3, equity_iterations=20)
+    second = simulate(20, ['AGGRESSIVE', 'TIGHT', 'MANIAC', 'CALLING_STATION'], seed=3, equity_iterations=20)
+    assert first['bot_types'] == second['bot_types']
+    assert first['hands'] == 20 and first['hands_per_second'] > 0
+    assert sum(stats['hands'] for stats in first['bot_types'].values()) == 20 * len(BOT_MIX)
+
+def test_next_phase_extends_cached_hand_strengths():
+    game = Game(headless=True, bot_types=BOT_MIX, seed=2)
+    game.setup_players()
+    for player in game.players:
+        player.evaluate_hand(game.community_cards)
+    for _ in range(3):
+        game.next_phase()
+        for player in game.players:
+            hole, count, state = player.strength_cache
+            assert count == len(game.community_cards)
+            assert state.strength() == game.poker_rules.hand_strength(player.cards + game.community_cards)
+
+def test_simulate_rejects_bad_table_size():
+    with pytest.raises(ValueError):
+        simulate(1, [BotType.AGGRESSIVE])
+
+def test_league_tables_cover_every_pairing():
+    tables = league_tables([2, 5])
+    assert len(tables) == 36 * 2
+    assert {tuple(sorted(set(table))) for table in tables if len(table) == 2} == \
+        {tuple(sorted({a.name, b.name})) for a in BotType for b in BotType}
+
+def test_run_league_is_reproducible_across_worker_counts():
+    first = run_league([2], hands_per_table=3, seed=5, workers=2, equity_iterations=0, chunk_size=2)
+    second = run_league([2], hands_per_table=3, seed=5, workers=1, equity_iterations=0, chunk_size=3)
+    assert first['bot_types'] == second['bot_types']
+    assert first['hands'] == 108
+    assert sum(stats['chip_delta'] for stats in first['bot_types'].values()) == 0
+
+def test_reused_table_plays_each_hand_from_its_own_stream():
+    together = play_hands(BOT_MIX, [random.Random(seed) for seed in (1, 2, 3)], 20)
+    alone = [play_hands(BOT_MIX, [random.Random(seed)], 20)[0] for seed in (1, 2, 3)]
+    assert together == alone
+    assert all(sum(seat['chip_delta'] for seat in hand) == 0 for hand in together)
+
+def test_new_hand_restores_the_table():
+    game = create_game(BOT_MIX, 0)
+    names = sorted(player.name for player in game.players)
+    play_hand(game)
+    game.new_hand(random.Random(4))
+    assert sorted(player.name for player in game.players) == names
+    assert game.pot == 0 and game.community_cards == [] and game.phase == Game.PRE_FLOP
+    assert len(game.deck) == 52 and all(player.cards == [] for player in game.players)
+
+def test_run_league_streams_every_hand():
+    streamed = []
+    result = run_league([2], hands_per_table=3, seed=6, workers=1, equity_iterations=0, chunk_size=1,
+                        on_hand=lambda table, hand: streamed.append((tuple(table), hand)))
+    assert len(streamed) == result['hands'] == 108
+    assert all(len(hand) == 2 for _, hand in streamed)
+    assert sum(seat['chip_delta'] for _, hand in streamed for seat in hand) == 0
+
+if __name__ == '__main__':
+    pytest.main(["-v", "test_simulation.py"])
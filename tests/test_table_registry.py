@@ -0,0 +1,116 @@
+import sys
+import os
+import threading
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from python_files.table_registry import TableRegistry, TableNotFoundError, TableLimitError
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_tables_are_independent():
+    registry = TableRegistry()
+    first = registry.create('game one')
+    second = registry.create('game two')
+    assert first != second
+    with registry.checkout(first) as game:
+        assert game == 'game one'
+    with registry.checkout(second) as game:
+        assert game == 'game two'
+
+def test_unknown_table_raises():
+    registry = TableRegistry()
+    with pytest.raises(TableNotFoundError):
+        with registry.checkout('missing'):
+            pass
+
+def test_replace_keeps_table_id():
+    registry = TableRegistry()
+    table_id = registry.create('old game')
+    assert registry.replace(table_id, 'new game') == table_id
+    with registry.checkout(table_id) as game:
+        assert game == 'new game'
+    assert len(registry) == 1
+
+def test_prepared_game_is_hidden_until_ready():
+    registry = TableRegistry()
+    game = {'ready': False}
+    seen = []
+
+    def read(table_id):
+        with registry.checkout(table_id) as other:
+            seen.append(other['ready'])
+
+    def prepare(table):
+        reader = threading.Thread(target=read, args=(table.table_id,))
+        reader.start()
+        reader.join(0.05)  # Il lettore resta in attesa del lock del tavolo
+        game['ready'] = True
+        prepare.reader = reader
+
+    registry.create(game, prepare)
+    prepare.reader.join()
+    assert seen == [True]
+
+def test_failed_prepare_keeps_the_previous_game():
+    registry = TableRegistry()
+    table_id = registry.create('old game')
+
+    def prepare(table):
+        raise RuntimeError("setup failed")
+
+    with pytest.raises(RuntimeError):
+        registry.replace(table_id, 'new game', prepare=prepare)
+    with registry.checkout(table_id) as game:
+        assert game == 'old game'
+    with pytest.raises(RuntimeError):
+        registry.create('broken game', prepare)
+    assert len(registry) == 1
+
+def test_idle_tables_are_evicted():
+    clock = FakeClock()
+    registry = TableRegistry(idle_timeout=60, clock=clock)
+    idle = registry.create('idle')
+    clock.now = 30
+    active = registry.create('active')
+    clock.now = 61
+    with registry.checkout(active):
+        pass
+    assert idle not in registry
+    assert active in registry
+
+def test_table_cap():
+    clock = FakeClock()
+    registry = TableRegistry(max_tables=2, idle_timeout=60, clock=clock)
+    registry.create('a')
+    registry.create('b')
+    with pytest.raises(TableLimitError):
+        registry.create('c')
+    clock.now = 120
+    registry.create('c')
+    assert len(registry) == 1
+
+def test_flask_routes_use_separate_tables():
+    pytest.importorskip('flask')
+    from texas_hold_em_poker import app
+
+    client = app.test_client()
+    first = client.post('/new-game').get_json()['table_id']
+    second = client.post('/new-game', json={'table_id': 'unknown'}).get_json()['table_id']
+    assert first != second
+    # Un'altra scheda dello stesso browser (stessi cookie, nessun table_id) apre un tavolo nuovo
+    assert client.post('/new-game').get_json()['table_id'] not in (first, second)
+    assert client.get('/state', query_string={'table_id': first}).status_code == 200
+    assert client.get('/state').status_code == 404
+    assert client.post('/new-game', query_string={'table_id': first}).get_json()['table_id'] == first
+    response = client.post('/advance-turn', query_string={'table_id': 'missing'})
+    assert response.status_code == 404
+
+if __name__ == '__main__':
+    pytest.main(["-v", "test_table_registry.py"])
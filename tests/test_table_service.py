@@ -0,0 +1,19 @@
+import sys
+import os
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from python_files import table_service
+from python_files.table_registry import TableRegistry
+
+def test_create_table_game_and_play():
+    registry = TableRegistry()
+    table_id, state = table_service.create_table_game(registry, seed=4)
+    assert state['table_id'] == table_id and table_id in registry
+    response = table_service.advance_turn(registry, table_id, since=state['version'])
+    assert response['since'] == state['version'] and response['events']
+    assert table_service.read_state(registry, table_id)['version'] == response['version']
+
+if __name__ == '__main__':
+    pytest.main(["-v", "test_table_service.py"])
@@ -1,20 +1,71 @@
 import os
 import sys
+import queue
 import logging
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 import atexit
 
-# Configurazione del logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
 # Importazione dei moduli di gioco
 sys.path.append(os.path.join(os.path.dirname(__file__), 'python_files'))
 from python_files.game import Game, BettingRound, Bot
+from python_files.events import format_sse
+from python_files.logging_config import configure_logging
+from python_files import metrics, table_service
+from python_files.table_registry import TableNotFoundError, TableLimitError
+from python_files.table_service import HEARTBEAT_INTERVAL, BadRequestError, parse_optional_int
+
+logger = logging.getLogger(__name__)
+
+# Serializzazione JSON delle risposte, cronometrata per le metriche
+JSON_SERIALIZATION = metrics.histogram('json_serialization', "Time to serialize JSON responses")
+
+class TimedJSONProvider(DefaultJSONProvider):
+    def dumps(self, obj, **kwargs):
+        with metrics.timer(JSON_SERIALIZATION):
+            return super().dumps(obj, **kwargs)
 
 # Definizione di Flask
 app = Flask(__name__, static_url_path="/static")
-game = None
+app.json = TimedJSONProvider(app)
+
+# Registro dei tavoli: ogni client (ogni scheda del browser) gioca al proprio tavolo, identificato dal
+# parametro table_id (URL o corpo della richiesta) che il client riceve da /new-game e invia a ogni chiamata
+registry = table_service.create_registry()
+
+# ID del tavolo della richiesta corrente
+def request_table_id():
+    body = request.get_json(silent=True) or {}
+    return request.args.get('table_id') or body.get('table_id') or request.form.get('table_id')
+
+# Seed del tavolo della richiesta (parametro seed), per rigiocare una mano; None per una mano casuale
+def request_seed():
+    body = request.get_json(silent=True) or {}
+    return parse_optional_int(request.args.get('seed', body.get('seed', request.form.get('seed'))), 'seed')
+
+# Crea una nuova partita al tavolo della richiesta (o a un nuovo tavolo) e ne restituisce lo stato
+def create_table_game(play_bots=False):
+    return table_service.create_table_game(registry, request_table_id(), play_bots, request_seed())
+
+# Versione dello stato già nota al client (parametro since), None se il client vuole lo stato completo
+def request_since():
+    body = request.get_json(silent=True) or {}
+    return parse_optional_int(request.args.get('since', body.get('since', request.form.get('since'))), 'since')
+
+@app.errorhandler(TableNotFoundError)
+def table_not_found(e):
+    logger.warning("Tavolo non trovato: %s", request_table_id())
+    return jsonify({'error': 'Table not found, start a new game'}), 404
+
+@app.errorhandler(BadRequestError)
+def bad_request(e):
+    logger.warning("Richiesta non valida: %s", e)
+    return jsonify({'error': str(e)}), 400
+
+@app.errorhandler(TableLimitError)
+def table_limit(e):
+    logger.warning("Limite di tavoli raggiunto: %s", e)
+    return jsonify({'error': str(e)}), 503
 
 @app.route("/", methods=["GET"])
 def index():
@@ -22,100 +73,119 @@ def index():
 
 @app.route("/new-game", methods=["POST"])
 def new_game():
-    global game
-    game = Game()
-    game.setup_players()
-    response = game.generate_game_state_response()
-    logger.info("Nuovo gioco creato con successo!")
+    table_id, response = create_table_game()
+    logger.info("Nuovo gioco creato con successo al tavolo %s!", table_id)
     return jsonify(response)
 
 @app.route("/start-game", methods=["POST"])
 def start_game():
-    global game
     try:
         logger.info("Avvio di una nuova partita...")
-        game = Game()
-        game.setup_players()
-        response = game.generate_game_state_response()
-        logger.info("Partita avviata con successo.")
+        table_id, response = create_table_game(play_bots=True)
+        logger.info("Partita avviata con successo al tavolo %s.", table_id)
         return jsonify(response), 200  # Assicurati di restituire un codice 200
+    except (TableLimitError, BadRequestError):
+        raise
     except Exception as e:
-        logger.error(f"Errore durante l'avvio della partita: {e}")
+        logger.error("Errore durante l'avvio della partita: %s", e)
         return jsonify({'error': str(e)}), 500
 
+@app.route("/events", methods=["GET"])
+def table_events():
+    table = registry.get(request_table_id())
+    listener = table.listen()
+    logger.info("Client connesso agli eventi del tavolo %s", table.table_id)
+
+    # Stream degli eventi del tavolo (azioni, carte, piatto, fasi, turni) finché il client resta connesso
+    def stream():
+        try:
+            yield "retry: 2000\n\n"
+            while True:
+                try:
+                    event = listener.get(timeout=HEARTBEAT_INTERVAL)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse(event)
+        finally:
+            table.unlisten(listener)
+
+    return Response(stream(), mimetype="text/event-stream",
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route("/state", methods=["GET"])
+def table_state():
+    return jsonify(table_service.read_state(registry, request_table_id(), request_since()))
+
+# Metriche in formato Prometheus (attive con POKER_METRICS=1)
+@app.route("/metrics", methods=["GET"])
+def metrics_endpoint():
+    return Response(metrics.render(table_service.gauges(registry)), content_type=metrics.CONTENT_TYPE)
+
 @app.route("/advance-turn", methods=["POST"])
 def advance_turn():
-    global game
     logger.info("Chiamata dell'endpoint advance-turn")
     try:
-        current_player = game.turn_manager.get_current_player()
-        logger.info(f"Turno attuale: {current_player.name}")
-        game.turn_manager.next_turn()
-        
-        if game.check_phase_end():
-            game.next_phase()
-        
-        response = game.generate_game_state_response()
+        response = table_service.advance_turn(registry, request_table_id(), request_since())
         logger.info("Turno avanzato correttamente")
         return jsonify(response)
+    except (TableNotFoundError, BadRequestError):
+        raise
     except Exception as e:
-        logger.error(f"Errore durante l'avanzamento del turno: {e}")
+        logger.error("Errore durante l'avanzamento del turno: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @app.route("/update-state", methods=["POST"])
 def update_state():
-    global game
     try:
         data = request.get_json()
-        logger.info(f"Aggiornamento dello stato ricevuto: {data}")
+        logger.debug("Aggiornamento dello stato ricevuto: %s", data)
         return jsonify({'message': 'Stato aggiornato con successo', 'data': data})
     except Exception as e:
-        logger.error(f"Errore nell'aggiornamento dello stato: {e}")
+        logger.error("Errore nell'aggiornamento dello stato: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @app.route("/action", methods=["POST"])
 def handle_action():
-    global game
     try:
-        action = request.json.get("action")
-        bet_amount = int(request.json.get("betAmount", 0))
-        logger.info(f"Gestione dell'azione: {action}, Importo: {bet_amount}")
-
-        current_player = game.turn_manager.get_current_player()
-        message = game.execute_turn(current_player, action, bet_amount)
-        response = game.generate_game_state_response()
-        response['message'] = message
+        data = request.get_json(silent=True) or request.form
+        action = data.get("action")
+        bet_amount = parse_optional_int(data.get("betAmount"), 'betAmount') or 0
+        logger.info("Gestione dell'azione: %s, Importo: %s", action, bet_amount)
 
-        logger.info(f"Azione gestita con successo: {response}")
+        response = table_service.play_action(registry, request_table_id(), action, bet_amount, request_since())
+        logger.debug("Azione gestita con successo: %s", response)
         return jsonify(response)
+    except (TableNotFoundError, BadRequestError):
+        raise
     except Exception as e:
-        logger.error(f"Errore durante la gestione dell'azione: {e}")
+        logger.error("Errore durante la gestione dell'azione: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @app.route("/execute-bot-turn", methods=["POST"])
 def execute_bot_turn():
-    global game
-    try:
-        logger.info("Esecuzione del turno del bot.")
-        bot_id = request.json.get('bot_id')
-        
-        bot = next((player for player in game.players if player.id == bot_id), None)
-        if not bot:
-            raise ValueError(f"Bot con ID {bot_id} non trovato.")
-        
-        logger.info(f"Bot trovato: {bot.name}")
-        game_state = game.generate_game_state_response()
-        decision, bet_amount = bot.make_decision(game_state, BettingRound.PRE_FLOP)
-
-        response = {
-            'decision': decision,
-            'bet_amount': bet_amount
-        }
-        logger.info(f"Risultato del turno bot: {response}")
-        return jsonify(response), 200
-    except Exception as e:
-        logger.error(f"Errore durante il turno del bot: {e}")
-        return jsonify({'error': str(e)}), 500
+    with registry.checkout(request_table_id()) as game:
+        try:
+            logger.info("Esecuzione del turno del bot.")
+            bot_id = request.json.get('bot_id')
+
+            bot = next((player for player in game.players if player.id == bot_id), None)
+            if not bot:
+                raise ValueError(f"Bot con ID {bot_id} non trovato.")
+
+            logger.info("Bot trovato: %s", bot.name)
+            game_state = game.generate_game_state_response()
+            decision, bet_amount = bot.make_decision(game_state, BettingRound.PRE_FLOP)
+
+            response = {
+                'decision': decision,
+                'bet_amount': bet_amount
+            }
+            logger.debug("Risultato del turno bot: %s", response)
+            return jsonify(response), 200
+        except Exception as e:
+            logger.error("Errore durante il turno del bot: %s", e)
+            return jsonify({'error': str(e)}), 500
 
 @app.route("/home_poker", methods=["GET"])
 def home_poker():
@@ -133,6 +203,8 @@ def clean_up():
 atexit.register(clean_up)
 
 if __name__ == "__main__":
+    # Configurazione del logging (solo avvisi ed errori, se non indicato diversamente con POKER_LOG_LEVEL)
+    configure_logging()
     logger.info("Avvio del server Flask...")
     app.run(debug=True, port=5001)
 
@@ -0,0 +1,202 @@
+import os
+import json
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+from python_files.events import format_sse
+from python_files.logging_config import configure_logging
+from python_files import metrics, table_service
+from python_files.table_registry import TableNotFoundError, TableLimitError, LISTENER_BACKLOG
+from python_files.table_service import HEARTBEAT_INTERVAL, BadRequestError, parse_optional_int
+
+# Modalità di servizio asincrona (ASGI) delle API del tavolo, alternativa al server Flask:
+#   uvicorn texas_hold_em_poker_asgi:app --port 5001
+# Le route sono coroutine: il lavoro sul motore di gioco (mosse e decisioni dei bot, comprese le
+# simulazioni dell'equity) gira in un pool di thread, così un tavolo lento non blocca le richieste
+# degli altri, e ogni client connesso agli eventi costa solo una coroutine in attesa.
+
+logger = logging.getLogger(__name__)
+
+registry = table_service.create_registry()
+JSON_SERIALIZATION = metrics.histogram('json_serialization', "Time to serialize JSON responses")
+executor = ThreadPoolExecutor(max_workers=int(os.environ.get('POKER_ENGINE_THREADS', 8)),
+                              thread_name_prefix='poker-engine')
+
+class Request:
+    def __init__(self, scope, body):
+        self.method = scope['method']
+        self.path = scope['path']
+        self.query = {key: values[-1] for key, values in parse_qs(scope.get('query_string', b'').decode()).items()}
+        headers = {name.decode().lower(): value.decode() for name, value in scope.get('headers', [])}
+
+        self.data = {}
+        content_type = headers.get('content-type', '')
+        if body and content_type.startswith('application/json'):
+            try:
+                self.data = json.loads(body) or {}
+            except ValueError:
+                raise BadRequestError("Malformed JSON body") from None
+            if not isinstance(self.data, dict):
+                raise BadRequestError("The JSON body must be an object")
+        elif body and content_type.startswith('application/x-www-form-urlencoded'):
+            self.data = {key: values[-1] for key, values in parse_qs(body.decode()).items()}
+
+    # Parametro della richiesta: URL, poi corpo
+    def get(self, name, default=None):
+        return self.query.get(name, self.data.get(name, default))
+
+    def table_id(self):
+        return self.get('table_id')
+
+    def since(self):
+        return parse_optional_int(self.get('since'), 'since')
+
+    # Seed del tavolo, per rigiocare una mano
+    def seed(self):
+        return parse_optional_int(self.get('seed'), 'seed')
+
+async def run_engine(function, *args):
+    return await asyncio.get_running_loop().run_in_executor(executor, function, *args)
+
+# Route asincrone: restituiscono (status, payload)
+
+async def new_game(request):
+    table_id, state = await run_engine(table_service.create_table_game, registry, request.table_id(), False,
+                                       request.seed())
+    logger.info("Nuovo gioco creato con successo al tavolo %s!", table_id)
+    return 200, state
+
+async def start_game(request):
+    table_id, state = await run_engine(table_service.create_table_game, registry, request.table_id(), True,
+                                       request.seed())
+    logger.info("Partita avviata con successo al tavolo %s.", table_id)
+    return 200, state
+
+async def handle_action(request):
+    action = request.get('action')
+    bet_amount = parse_optional_int(request.get('betAmount'), 'betAmount') or 0
+    return 200, await run_engine(table_service.play_action, registry, request.table_id(), action, bet_amount,
+                                 request.since())
+
+async def handle_advance_turn(request):
+    return 200, await run_engine(table_service.advance_turn, registry, request.table_id(), request.since())
+
+async def handle_state(request):
+    return 200, await run_engine(table_service.read_state, registry, request.table_id(), request.since())
+
+ROUTES = {
+    ('POST', '/new-game'): new_game,
+    ('POST', '/start-game'): start_game,
+    ('POST', '/action'): handle_action,
+    ('POST', '/advance-turn'): handle_advance_turn,
+    ('GET', '/state'): handle_state,
+}
+
+# Inoltra gli eventi del tavolo (pubblicati nei thread del motore) a una coda asyncio del ciclo di eventi
+class AsyncListener:
+    def __init__(self, loop):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=LISTENER_BACKLOG)
+
+    def put_nowait(self, event):
+        self.loop.call_soon_threadsafe(self.deliver, event)
+
+    def deliver(self, event):
+        if not self.queue.full():
+            self.queue.put_nowait(event)
+
+async def send_json(send, status, payload):
+    with metrics.timer(JSON_SERIALIZATION):
+        body = json.dumps(payload).encode()
+    headers = [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())]
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': body})
+
+async def send_metrics(send):
+    body = metrics.render(table_service.gauges(registry)).encode()
+    await send({'type': 'http.response.start', 'status': 200,
+                'headers': [(b'content-type', metrics.CONTENT_TYPE.encode())]})
+    await send({'type': 'http.response.body', 'body': body})
+
+async def stream_events(request, receive, send):
+    table = registry.get(request.table_id())
+    listener = AsyncListener(asyncio.get_running_loop())
+    table.listen(listener)
+    disconnected = asyncio.ensure_future(wait_for_disconnect(receive))
+    logger.info("Client connesso agli eventi del tavolo %s", table.table_id)
+    try:
+        await send({'type': 'http.response.start', 'status': 200, 'headers': [
+            (b'content-type', b'text/event-stream'), (b'cache-control', b'no-cache'), (b'x-accel-buffering', b'no')
+        ]})
+        await send({'type': 'http.response.body', 'body': b'retry: 2000\n\n', 'more_body': True})
+        while not disconnected.done():
+            next_event = asyncio.ensure_future(listener.queue.get())
+            done, _ = await asyncio.wait({next_event, disconnected}, timeout=HEARTBEAT_INTERVAL,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if next_event in done:
+                chunk = format_sse(next_event.result())
+            else:
+                next_event.cancel()
+                if disconnected in done:
+                    break
+                chunk = ": keep-alive\n\n"
+            await send({'type': 'http.response.body', 'body': chunk.encode(), 'more_body': True})
+    finally:
+        table.unlisten(listener)
+        disconnected.cancel()
+
+async def wait_for_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+async def read_body(receive):
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if not message.get('more_body'):
+            return body
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            configure_logging()  # All'avvio del server, non all'importazione del modulo
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            executor.shutdown(wait=False)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        return await lifespan(receive, send)
+    if scope['type'] != 'http':
+        return
+
+    try:
+        if (scope['method'], scope['path']) == ('GET', '/events'):
+            return await stream_events(Request(scope, b''), receive, send)
+        if (scope['method'], scope['path']) == ('GET', '/metrics'):
+            return await send_metrics(send)
+        handler = ROUTES.get((scope['method'], scope['path']))
+        if handler is None:
+            return await send_json(send, 404, {'error': f"Not found: {scope['method']} {scope['path']}"})
+        result = await handler(Request(scope, await read_body(receive)))
+        await send_json(send, *result)
+    except TableNotFoundError:
+        await send_json(send, 404, {'error': 'Table not found, start a new game'})
+    except BadRequestError as e:
+        await send_json(send, 400, {'error': str(e)})
+    except TableLimitError as e:
+        await send_json(send, 503, {'error': str(e)})
+    except Exception as e:
+        logger.error("Errore durante la richiesta %s: %s", scope['path'], e)
+        await send_json(send, 500, {'error': str(e)})
+
+if __name__ == "__main__":
+    import uvicorn
+    logger.info("Avvio del server ASGI...")
+    uvicorn.run(app, port=5001)